@@ -0,0 +1,41 @@
+"""Add a partial index for pending invitation lookups
+
+Revision ID: add_invitation_pending_index
+Revises: registration_org_fk_set_null
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_invitation_pending_index'
+down_revision = 'registration_org_fk_set_null'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add an index matching the pending invitations listing"""
+
+    # invitation_tokens is created by create_all (init_db), not by this
+    # chain; when it does not exist yet, create_all will add the index
+    # declared on the InvitationToken model
+    if not sa.inspect(op.get_bind()).has_table('invitation_tokens'):
+        return
+
+    # Unused invitations only, so the index stays proportional to open
+    # invitations rather than invitation history. Token lookups are already
+    # served by the unique constraint on invitation_tokens.token
+    op.create_index(
+        'ix_invitation_tokens_org_pending',
+        'invitation_tokens',
+        ['organization_id', 'expires_at'],
+        postgresql_where=sa.text('is_used = false'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    """Remove the pending invitations index"""
+    op.drop_index('ix_invitation_tokens_org_pending', 'invitation_tokens', if_exists=True)
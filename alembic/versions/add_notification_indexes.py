@@ -0,0 +1,50 @@
+"""Add composite indexes for notification queries
+
+Revision ID: add_notification_indexes
+Revises: 2c7527da8955
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_notification_indexes'
+down_revision = '2c7527da8955'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add indexes matching the notifications list and stats predicates"""
+
+    # notifications is created by create_all (init_db), not by this chain;
+    # when it does not exist yet, create_all will add the indexes declared
+    # on the Notification model
+    if not sa.inspect(op.get_bind()).has_table('notifications'):
+        return
+
+    # Serves the per-user list ordered by (created_at DESC, id DESC) and its
+    # keyset cursor without a sort step
+    op.create_index(
+        'ix_notif_user_created',
+        'notifications',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        if_not_exists=True
+    )
+
+    # Partial index over unread rows only; keeps unread_only listings and the
+    # unread count proportional to unread volume rather than total history
+    op.create_index(
+        'ix_notif_user_unread',
+        'notifications',
+        ['user_id'],
+        postgresql_where=sa.text('read = false'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    """Remove notification indexes"""
+    op.drop_index('ix_notif_user_unread', 'notifications', if_exists=True)
+    op.drop_index('ix_notif_user_created', 'notifications', if_exists=True)
@@ -0,0 +1,44 @@
+"""Add covering indexes for organization membership lookups
+
+Revision ID: add_org_member_lookup_indexes
+Revises: add_notification_indexes
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_org_member_lookup_indexes'
+down_revision = 'add_notification_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Replace the plain (user_id, organization_id) index with a covering one"""
+
+    # (user_id, organization_id) with role in the leaf pages: role lookups
+    # and the per-user membership aggregate become index-only scans.
+    # Owner checks by (organization_id, user_id) are served by the
+    # unique_org_user constraint's index
+    op.create_index(
+        'ix_org_member_user_org',
+        'organization_members',
+        ['user_id', 'organization_id'],
+        postgresql_include=['role'],
+        if_not_exists=True
+    )
+
+    # Same key columns without role; superseded by the covering index
+    op.drop_index('idx_org_members_user_org', 'organization_members', if_exists=True)
+
+
+def downgrade():
+    """Restore the plain membership lookup index"""
+    op.create_index(
+        'idx_org_members_user_org',
+        'organization_members',
+        ['user_id', 'organization_id'],
+        if_not_exists=True
+    )
+    op.drop_index('ix_org_member_user_org', 'organization_members')
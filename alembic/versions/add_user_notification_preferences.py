@@ -0,0 +1,25 @@
+"""Add notification_preferences to users
+
+Revision ID: add_user_notification_prefs
+Revises: add_invitation_pending_index
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_notification_prefs'
+down_revision = 'add_invitation_pending_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Store each user's notification preference overrides"""
+    op.add_column('users', sa.Column('notification_preferences', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    """Remove users.notification_preferences"""
+    op.drop_column('users', 'notification_preferences')
@@ -0,0 +1,30 @@
+"""Add an index on lower(users.email)
+
+Revision ID: add_users_email_lower_index
+Revises: add_user_notification_prefs
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_users_email_lower_index'
+down_revision = 'add_user_notification_prefs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index case-insensitive email lookups"""
+    op.create_index(
+        'ix_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    """Remove the case-insensitive email index"""
+    op.drop_index('ix_users_email_lower', 'users', if_exists=True)
@@ -0,0 +1,43 @@
+"""Set registrations.organization_id to NULL when its organization is deleted
+
+Revision ID: registration_org_fk_set_null
+Revises: add_org_member_lookup_indexes
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'registration_org_fk_set_null'
+down_revision = 'add_org_member_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Let a single DELETE on organizations succeed for registered organizations"""
+    op.drop_constraint(
+        'fk_registrations_organization_id_organizations',
+        'registrations',
+        type_='foreignkey'
+    )
+    op.create_foreign_key(
+        'fk_registrations_organization_id_organizations',
+        'registrations', 'organizations',
+        ['organization_id'], ['id'],
+        ondelete='SET NULL'
+    )
+
+
+def downgrade():
+    """Restore the plain foreign key"""
+    op.drop_constraint(
+        'fk_registrations_organization_id_organizations',
+        'registrations',
+        type_='foreignkey'
+    )
+    op.create_foreign_key(
+        'fk_registrations_organization_id_organizations',
+        'registrations', 'organizations',
+        ['organization_id'], ['id']
+    )
@@ -11,6 +11,7 @@ import json
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.cache import invalidate_member_caches
 from app.core.deps import get_current_active_user
 from app.models.user import User
 from app.models.organization import Organization, OrganizationMember
@@ -159,6 +160,9 @@ async def process_bulk_user_import(
         operation.error_details = {'error': str(e)}
         operation.completed_at = datetime.utcnow()
         db.commit()
+    finally:
+        # Rows committed before any failure have already added members
+        invalidate_member_caches(organization_id)
 
 
 @router.post("/organizations/{organization_id}/bulk-operations", response_model=BulkUserOperationResponse)
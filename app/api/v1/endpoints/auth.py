@@ -1,23 +1,23 @@
 """
 Authentication endpoints
 """
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from typing import Optional
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.sql import func
+import asyncio
 import pyotp
-import qrcode
-import io
-import base64
+import segno
 import logging
+import uuid
 
 from app.core.database import get_db
 from app.services.session_service import SessionService
 from app.core.security import (
-    hash_password, verify_password, create_access_token, create_refresh_token,
+    hash_password_async, verify_password_async, password_needs_rehash,
+    get_dummy_password_hash, create_access_token, create_refresh_token,
     verify_token, generate_2fa_secret, verify_2fa_token,
     generate_email_verification_token, generate_password_reset_token
 )
@@ -27,14 +27,16 @@ from app.core.exceptions import (
 from app.models.user import User
 from app.models.organization import Organization, OrganizationMember
 from app.models.registration import Registration
+from app.models.session import UserSession
 from app.schemas.auth import (
     UserRegister, UserLogin, AuthResponse, TokenResponse, UserResponse, OrganizationInfo,
     RefreshTokenRequest, ForgotPasswordRequest, ResetPasswordRequest,
     VerifyEmailRequest, Enable2FAResponse, Verify2FARequest, ChangePasswordRequest
 )
 from app.core.deps import get_current_active_user
+from app.core.http_cache import weak_etag, etag_matches, set_etag, not_modified
 from app.config import settings
-from app.services.email_service import email_service
+from app.services.email_service import email_service, send_in_background
 
 router = APIRouter()
 security = HTTPBearer(auto_error=False)
@@ -44,7 +46,6 @@ logger = logging.getLogger(__name__)
 @router.post("/register", response_model=AuthResponse, status_code=201)
 async def register(
     user_data: UserRegister,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Register a new user"""
@@ -59,6 +60,11 @@ async def register(
         default_org_name = f"{user_data.first_name}'s Organization" if user_data.first_name else "My Organization"
         org_name = user_data.organization_name if user_data.organization_name else default_org_name
 
+        # Generate primary keys client-side so every row can be inserted in a
+        # single flush instead of committing after each insert
+        user_id = uuid.uuid4()
+        organization_id = uuid.uuid4()
+
         registration = Registration(
             first_name=user_data.first_name,
             last_name=user_data.last_name,
@@ -70,16 +76,16 @@ async def register(
             terms_accepted=True,
             privacy_policy_accepted=True,
             status='completed',
-            registration_source='web'
+            registration_source='web',
+            user_id=user_id,
+            organization_id=organization_id,
+            processed_at=datetime.now(timezone.utc)
         )
 
-        db.add(registration)
-        await db.commit()
-        await db.refresh(registration)
-
         # Create new user
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         user = User(
+            id=user_id,
             email=user_data.email,
             password_hash=hashed_password,
             first_name=user_data.first_name,
@@ -87,52 +93,42 @@ async def register(
             email_verified=False  # Will be verified via email
         )
 
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-
         # Create default organization for the user using registration data
         organization = Organization(
+            id=organization_id,
             name=registration.organization_name,
             description=f"Default organization for {user.full_name}",
             domain=registration.organization_domain,
-            created_by=user.id
+            created_by=user_id
         )
 
-        db.add(organization)
-        await db.commit()
-        await db.refresh(organization)
-
         # Add user as owner of the organization
         org_member = OrganizationMember(
-            organization_id=organization.id,
-            user_id=user.id,
+            organization_id=organization_id,
+            user_id=user_id,
             role="owner",
-            invited_by=user.id  # Self-invited as the creator
+            invited_by=user_id  # Self-invited as the creator
         )
 
-        db.add(org_member)
-        await db.commit()
-
-        # Update registration record with created user and organization
-        registration.user_id = user.id
-        registration.organization_id = organization.id
-        registration.processed_at = func.now()
-        await db.commit()
-
-        # Create database session instead of JWT tokens (consistent with login)
-        session_service = SessionService(db)
-
-        # Create session in database
-        session = await session_service.create_session(
-            user_id=user.id,
+        # Create database session instead of JWT tokens (consistent with login).
+        # A brand-new user has no stale sessions to clean up, so the session row
+        # is built up front and inserted alongside the others.
+        session = UserSession.create_session(
+            user_id=user_id,
+            session_duration_hours=24,
             ip_address=None,  # Could extract from request if needed
-            user_agent=None,  # Could extract from request if needed
-            session_duration_hours=24
+            user_agent=None  # Could extract from request if needed
         )
 
+        db.add_all([user, organization, org_member, registration, session])
+        await db.flush()
+
+        # created_at is server-generated and needed for the response
+        await db.refresh(user, attribute_names=["created_at"])
+        await db.commit()
+
         # Send welcome email in background
-        background_tasks.add_task(
+        send_in_background(
             email_service.send_welcome_email,
             user.email,
             f"{user.first_name} {user.last_name}",
@@ -171,35 +167,39 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     """Login user with database session"""
-    # Find user by email
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    user = result.scalar_one_or_none()
-
-    if not user or not verify_password(user_data.password, user.password_hash):
-        raise AuthenticationError("Invalid email or password")
-
-    # Get user's primary organization (first one they're a member of)
-    org_member_result = await db.execute(
-        select(OrganizationMember, Organization)
-        .join(Organization, OrganizationMember.organization_id == Organization.id)
-        .where(OrganizationMember.user_id == user.id)
+    # Find user by email together with their primary organization
+    # (first one they're a member of) in a single round-trip
+    result = await db.execute(
+        select(User, OrganizationMember, Organization)
+        .outerjoin(OrganizationMember, OrganizationMember.user_id == User.id)
+        .outerjoin(Organization, OrganizationMember.organization_id == Organization.id)
+        .where(User.email == user_data.email)
         .order_by(OrganizationMember.joined_at.asc())
         .limit(1)
     )
-    org_member_data = org_member_result.first()
+    user, org_member, organization = result.first() or (None, None, None)
+
+    # Unknown emails are checked against a dummy hash so both paths pay for
+    # a bcrypt verify and timing doesn't reveal which emails exist
+    password_hash = user.password_hash if user else get_dummy_password_hash()
+    password_valid = await verify_password_async(user_data.password, password_hash)
+    if not user or not password_valid:
+        raise AuthenticationError("Invalid email or password")
+
+    # Progressively upgrade hashes made with a lower cost than current policy
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(user_data.password)
 
     organization_info = None
-    if org_member_data:
-        org_member, organization = org_member_data
+    if org_member and organization:
         organization_info = OrganizationInfo(
             id=organization.id,
             name=organization.name,
             role=org_member.role
         )
 
-    # Update last login
-    user.last_login_at = datetime.utcnow()
-    await db.commit()
+    # Update last login (committed together with the new session)
+    user.last_login_at = datetime.now(timezone.utc)
 
     # Create database session instead of JWT tokens
     session_service = SessionService(db)
@@ -258,8 +258,18 @@ async def refresh_token(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_active_user)):
+async def get_me(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user)
+):
     """Return current authenticated user (auth alias for /users/me)."""
+    # Any profile change bumps updated_at, so it versions the response
+    etag = weak_etag(current_user.id, int(current_user.updated_at.timestamp()))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     # User is already loaded from the dependency, no additional DB queries needed
     return UserResponse.model_validate(current_user)
 
@@ -318,6 +328,12 @@ async def verify_email(
     return {"success": True, "message": "Email verified successfully"}
 
 
+def _render_qr_code_data_url(data: str) -> str:
+    """Render a QR code as a PNG data URL"""
+    qr = segno.make_qr(data, error="m")
+    return qr.png_data_uri(scale=10, border=5)
+
+
 @router.post("/enable-2fa", response_model=Enable2FAResponse)
 async def enable_2fa(
     current_user: User = Depends(get_current_active_user),
@@ -337,16 +353,9 @@ async def enable_2fa(
         issuer_name=settings.app_name
     )
 
-    # Create QR code image
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(qr_url)
-    qr.make(fit=True)
-
-    img = qr.make_image(fill_color="black", back_color="white")
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_str = base64.b64encode(img_buffer.getvalue()).decode()
-    qr_code_url = f"data:image/png;base64,{img_str}"
+    # Create QR code image off the event loop
+    loop = asyncio.get_running_loop()
+    qr_code_url = await loop.run_in_executor(None, _render_qr_code_data_url, qr_url)
 
     # Store secret (not enabled until verified)
     current_user.two_factor_secret = secret
@@ -385,11 +394,11 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Change user password"""
-    if not verify_password(request_data.current_password, current_user.password_hash):
+    if not await verify_password_async(request_data.current_password, current_user.password_hash):
         raise AuthenticationError("Current password is incorrect")
 
     # Update password
-    current_user.password_hash = hash_password(request_data.new_password)
+    current_user.password_hash = await hash_password_async(request_data.new_password)
     await db.commit()
 
     return {"success": True, "message": "Password changed successfully"}
@@ -401,23 +410,22 @@ async def get_registration_details(
     db: AsyncSession = Depends(get_db)
 ):
     """Get user registration details from database"""
-    # Get registration record for current user
+    # Get registration record and organization details for current user in
+    # one query. Memberships are read here rather than from current_user,
+    # whose cached session graph can predate a newly created or joined org
     result = await db.execute(
-        select(Registration).where(Registration.user_id == current_user.id)
+        select(Registration, OrganizationMember, Organization)
+        .outerjoin(OrganizationMember, OrganizationMember.user_id == Registration.user_id)
+        .outerjoin(Organization, OrganizationMember.organization_id == Organization.id)
+        .where(Registration.user_id == current_user.id)
+        .order_by(OrganizationMember.joined_at.asc())
+        .limit(1)
     )
-    registration = result.scalar_one_or_none()
+    registration, org_member, organization = result.first() or (None, None, None)
 
     if not registration:
         raise HTTPException(status_code=404, detail="Registration details not found")
 
-    # Get organization details
-    org_result = await db.execute(
-        select(OrganizationMember, Organization)
-        .join(Organization, OrganizationMember.organization_id == Organization.id)
-        .where(OrganizationMember.user_id == current_user.id)
-    )
-    org_member, organization = org_result.first() or (None, None)
-
     return {
         "success": True,
         "data": {
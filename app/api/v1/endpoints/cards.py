@@ -21,7 +21,7 @@ from app.models.comment import Comment
 from app.models.attachment import Attachment
 from app.services.role_permissions import role_permissions
 from app.schemas.card import (
-    CardCreate, CardUpdate, CardResponse, CardMove, CardAssignmentResponse,
+    CardCreate, CardUpdate, CardResponse, CardMove, CardAssignmentResponse, CardChecklistItemResponse,
     CommentCreate, CommentUpdate, CommentResponse,
     AttachmentResponse, ActivityResponse
 )
@@ -207,19 +207,9 @@ async def list_cards(
 
             # Handle checklist items if loaded
             if hasattr(card, 'checklist_items') and card.checklist_items:
-                for item in card.checklist_items:
-                    item_data = {
-                        "id": str(item.id),
-                        "text": item.text,
-                        "completed": item.completed,
-                        "position": item.position,
-                        "ai_generated": item.ai_generated,
-                        "confidence": item.confidence,
-                        "metadata": item.ai_metadata,
-                        "created_at": item.created_at.isoformat() if item.created_at else None,
-                        "updated_at": item.updated_at.isoformat() if item.updated_at else None
-                    }
-                    card_data['checklist_items'].append(item_data)
+                card_data['checklist_items'] = [
+                    CardChecklistItemResponse.from_item(item) for item in card.checklist_items
+                ]
 
             response_cards.append(CardResponse(**card_data))
 
@@ -357,19 +347,9 @@ async def get_cards(
 
             # Handle checklist items if loaded
             if hasattr(card, 'checklist_items') and card.checklist_items:
-                for item in card.checklist_items:
-                    item_data = {
-                        "id": str(item.id),
-                        "text": item.text,
-                        "completed": item.completed,
-                        "position": item.position,
-                        "ai_generated": item.ai_generated,
-                        "confidence": item.confidence,
-                        "metadata": item.ai_metadata,
-                        "created_at": item.created_at.isoformat() if item.created_at else None,
-                        "updated_at": item.updated_at.isoformat() if item.updated_at else None
-                    }
-                    card_data['checklist_items'].append(item_data)
+                card_data['checklist_items'] = [
+                    CardChecklistItemResponse.from_item(item) for item in card.checklist_items
+                ]
 
             response_cards.append(CardResponse(**card_data))
 
@@ -414,38 +394,8 @@ async def get_card(
     if not org_member_result.scalar_one_or_none():
         raise InsufficientPermissionsError("Access denied")
     
-    # Format response with assignments and checklist
-    card_response = CardResponse.from_orm(card)
-    if card.assignments:
-        card_response.assignments = []
-        for assignment in card.assignments:
-            assignment_data = CardAssignmentResponse.from_orm(assignment)
-            assignment_data.user = {
-                "id": str(assignment.user.id),
-                "email": assignment.user.email,
-                "first_name": assignment.user.first_name,
-                "last_name": assignment.user.last_name,
-                "avatar_url": assignment.user.avatar_url
-            }
-            card_response.assignments.append(assignment_data)
-
-    # Add checklist items
-    if card.checklist_items:
-        card_response.checklist_items = []
-        for item in sorted(card.checklist_items, key=lambda x: x.position):
-            card_response.checklist_items.append({
-                "id": str(item.id),
-                "text": item.text,
-                "completed": item.completed,
-                "position": item.position,
-                "ai_generated": item.ai_generated,
-                "confidence": item.confidence,
-                "metadata": item.ai_metadata,
-                "created_at": item.created_at.isoformat(),
-                "updated_at": item.updated_at.isoformat()
-            })
-
-    return card_response
+    # Format response with assignments and checklist (ordered by position)
+    return CardResponse.from_orm(card)
 
 
 @router.put("/{card_id}", response_model=CardResponse)
@@ -16,7 +16,7 @@ from app.models.organization import OrganizationMember
 from app.models.board import Board
 from app.models.column import Column
 from app.schemas.project import ColumnCreate, ColumnUpdate, ColumnResponse, ColumnOrderUpdate
-from app.schemas.card import CardCreate, CardResponse, CardAssignmentResponse
+from app.schemas.card import CardCreate, CardResponse
 from app.models.card import Card, CardAssignment, ChecklistItem
 from fastapi import HTTPException
 
@@ -394,25 +394,8 @@ async def get_column_cards(
     )
     cards = result.scalars().all()
 
-    # Format response
-    response = []
-    for card in cards:
-        card_response = CardResponse.from_orm(card)
-        if card.assignments:
-            card_response.assignments = []
-            for assignment in card.assignments:
-                assignment_data = CardAssignmentResponse.from_orm(assignment)
-                assignment_data.user = {
-                    "id": str(assignment.user.id),
-                    "email": assignment.user.email,
-                    "first_name": assignment.user.first_name,
-                    "last_name": assignment.user.last_name,
-                    "avatar_url": assignment.user.avatar_url
-                }
-                card_response.assignments.append(assignment_data)
-        response.append(card_response)
-
-    return response
+    # CardResponse.from_orm builds the eager-loaded assignments itself
+    return [CardResponse.from_orm(card) for card in cards]
 
 
 @router.post("/{column_id}/cards", response_model=CardResponse)
@@ -1,31 +1,90 @@
 """
 Notifications API endpoints
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import base64
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, insert, update, delete, func, and_, or_, tuple_, bindparam
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
+from app.core.exceptions import ValidationError, InsufficientPermissionsError
+from app.core.http_cache import weak_etag, etag_matches, set_etag, not_modified
 from app.models.user import User
+from app.models.organization import OrganizationMember
 from app.models.notification import Notification, NotificationPreference
 from app.models.ai_automation import SmartNotification
 from app.schemas.notification import (
-    NotificationCreate, NotificationUpdate, NotificationResponse,
+    NotificationCreate, NotificationUpdate, NotificationResponse, BulkNotificationCreate,
     NotificationPreferenceCreate, NotificationPreferenceUpdate, NotificationPreferenceResponse
 )
 from app.services.enhanced_notification_service import EnhancedNotificationService
 from app.services.organization_service import OrganizationService
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+# Columns served by the list endpoint; selected directly so rows skip ORM
+# instantiation and per-object from_attributes validation
+_NOTIFICATION_LIST_COLUMNS = (
+    Notification.id,
+    Notification.user_id,
+    Notification.organization_id,
+    Notification.title,
+    Notification.message,
+    Notification.type,
+    Notification.priority,
+    Notification.read,
+    Notification.action_url,
+    Notification.notification_metadata,
+    Notification.created_at,
+    Notification.read_at,
+    Notification.expires_at,
+)
+
+# Rows per multi-row INSERT; each row binds about ten parameters, far below
+# Postgres' 32767 bind parameter limit per statement
+BULK_INSERT_BATCH_SIZE = 200
+
+
+# Statements built once at import; handlers only bind parameters
+_NOTIFICATIONS_BY_USER = select(*_NOTIFICATION_LIST_COLUMNS).where(
+    Notification.user_id == bindparam("user_id")
+)
+_NOTIFICATION_COUNTS_BY_USER = select(
+    func.count(Notification.id),
+    func.count(Notification.id).filter(Notification.read == False)
+).where(Notification.user_id == bindparam("user_id"))
+
+
+def _encode_cursor(created_at: datetime, notification_id: UUID) -> str:
+    """Encode the keyset position of a notification as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{notification_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by _encode_cursor"""
+    try:
+        created_at, notification_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(notification_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header"),
     unread_only: bool = Query(False),
     notification_type: Optional[str] = Query(None),
     current_user: User = Depends(get_current_active_user),
@@ -34,7 +93,7 @@ async def get_notifications(
     """Get notifications for current user"""
     try:
         # Build query
-        query = select(Notification).where(Notification.user_id == current_user.id)
+        query = _NOTIFICATIONS_BY_USER
         
         if unread_only:
             query = query.where(Notification.read == False)
@@ -42,14 +101,31 @@ async def get_notifications(
         if notification_type:
             query = query.where(Notification.type == notification_type)
         
-        # Order by created_at desc and apply pagination
-        query = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit)
+        # Order by created_at desc; a cursor continues after the last row of
+        # the previous page, otherwise fall back to offset pagination
+        query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
+        if cursor:
+            query = query.where(
+                tuple_(Notification.created_at, Notification.id) < _decode_cursor(cursor)
+            )
+        else:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
-        result = await db.execute(query)
-        notifications = result.scalars().all()
+        result = await db.execute(query, {"user_id": current_user.id})
+        notifications = [dict(row) for row in result.mappings()]
         
-        return notifications
+        headers = {}
+        if len(notifications) == limit:
+            last = notifications[-1]
+            headers["X-Next-Cursor"] = _encode_cursor(last["created_at"], last["id"])
         
+        # Rows come straight from the table and already match
+        # NotificationResponse, so serialize them without re-validation
+        return ORJSONResponse(content=notifications, headers=headers)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -75,20 +151,25 @@ async def create_notification(
             # For simplicity, we'll allow it for now but log it
             pass
 
-        notification = Notification(
-            user_id=target_user_id,
-            organization_id=notification_data.organization_id,
-            title=notification_data.title,
-            message=notification_data.message,
-            type=notification_data.type,
-            priority=notification_data.priority,
-            action_url=notification_data.action_url,
-            notification_metadata=notification_data.notification_metadata
+        # Core INSERT ... RETURNING fills server defaults in the same
+        # round-trip, so no ORM flush or refresh is needed
+        result = await db.execute(
+            insert(Notification)
+            .values(
+                user_id=target_user_id,
+                organization_id=notification_data.organization_id,
+                title=notification_data.title,
+                message=notification_data.message,
+                type=notification_data.type,
+                priority=notification_data.priority,
+                action_url=notification_data.action_url,
+                notification_metadata=notification_data.notification_metadata
+            )
+            .returning(*_NOTIFICATION_LIST_COLUMNS)
         )
+        notification = dict(result.mappings().one())
         
-        db.add(notification)
         await db.commit()
-        await db.refresh(notification)
         
         return notification
         
@@ -100,6 +181,72 @@ async def create_notification(
         )
 
 
+@router.post("/bulk", response_model=List[NotificationResponse])
+async def create_bulk_notifications(
+    notification_data: BulkNotificationCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create the same notification for several members of an organization (owners/admins only)"""
+    organization_id = notification_data.organization_id
+    sender_role = await db.scalar(
+        select(OrganizationMember.role).where(
+            OrganizationMember.user_id == current_user.id,
+            OrganizationMember.organization_id == organization_id
+        )
+    )
+    if sender_role not in ('admin', 'owner'):
+        raise InsufficientPermissionsError("Only organization owners/admins can send bulk notifications")
+
+    # Recipients must all be members of the organization
+    user_ids = list(dict.fromkeys(notification_data.user_ids))
+    member_ids = set(await db.scalars(
+        select(OrganizationMember.user_id).where(
+            OrganizationMember.organization_id == organization_id,
+            OrganizationMember.user_id.in_(user_ids)
+        )
+    ))
+    if len(member_ids) != len(user_ids):
+        raise ValidationError("All recipients must be members of the organization")
+
+    try:
+        values = [
+            {
+                "user_id": user_id,
+                "organization_id": organization_id,
+                "title": notification_data.title,
+                "message": notification_data.message,
+                "type": notification_data.type,
+                "priority": notification_data.priority,
+                "action_url": notification_data.action_url,
+                "notification_metadata": notification_data.notification_metadata
+            }
+            for user_id in user_ids
+        ]
+        
+        # Multi-row INSERT ... RETURNING, in batches that stay well under
+        # Postgres' bind parameter limit
+        notifications = []
+        for start in range(0, len(values), BULK_INSERT_BATCH_SIZE):
+            result = await db.execute(
+                insert(Notification)
+                .values(values[start:start + BULK_INSERT_BATCH_SIZE])
+                .returning(*_NOTIFICATION_LIST_COLUMNS)
+            )
+            notifications.extend(dict(row) for row in result.mappings())
+        
+        await db.commit()
+        
+        return notifications
+        
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create notifications: {str(e)}"
+        )
+
+
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_notification_read(
     notification_id: str,
@@ -108,14 +255,17 @@ async def mark_notification_read(
 ):
     """Mark a notification as read"""
     try:
-        # Get notification
+        # Mark as read and fetch the updated row in one round-trip
         result = await db.execute(
-            select(Notification).where(
+            update(Notification)
+            .where(
                 and_(
                     Notification.id == notification_id,
                     Notification.user_id == current_user.id
                 )
             )
+            .values(read=True, read_at=datetime.now(timezone.utc))
+            .returning(Notification)
         )
         notification = result.scalar_one_or_none()
         
@@ -125,12 +275,7 @@ async def mark_notification_read(
                 detail="Notification not found"
             )
         
-        # Mark as read
-        notification.read = True
-        notification.read_at = func.now()
-        
         await db.commit()
-        await db.refresh(notification)
         
         return notification
         
@@ -150,22 +295,26 @@ async def mark_all_notifications_read(
     db: AsyncSession = Depends(get_db)
 ):
     """Mark all notifications as read for current user"""
+    # Bound once as a parameter so every row gets the same timestamp
+    now = datetime.now(timezone.utc)
     try:
-        # Update all unread notifications
-        await db.execute(
-            Notification.__table__.update()
+        # Update all unread notifications in a single statement; nothing in
+        # the session needs to see the new values, so skip ORM synchronization
+        result = await db.execute(
+            update(Notification)
             .where(
                 and_(
                     Notification.user_id == current_user.id,
                     Notification.read == False
                 )
             )
-            .values(read=True, read_at=func.now())
+            .values(read=True, read_at=now)
+            .execution_options(synchronize_session=False)
         )
         
         await db.commit()
         
-        return {"message": "All notifications marked as read"}
+        return {"message": "All notifications marked as read", "updated": result.rowcount}
         
     except Exception as e:
         await db.rollback()
@@ -183,24 +332,23 @@ async def delete_notification(
 ):
     """Delete a notification"""
     try:
-        # Get notification
         result = await db.execute(
-            select(Notification).where(
+            delete(Notification)
+            .where(
                 and_(
                     Notification.id == notification_id,
                     Notification.user_id == current_user.id
                 )
             )
+            .returning(Notification.id)
         )
-        notification = result.scalar_one_or_none()
         
-        if not notification:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Notification not found"
             )
         
-        await db.delete(notification)
         await db.commit()
         
         return {"message": "Notification deleted successfully"}
@@ -217,26 +365,23 @@ async def delete_notification(
 
 @router.get("/stats")
 async def get_notification_stats(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get notification statistics for current user"""
     try:
-        # Get total and unread counts
-        total_result = await db.execute(
-            select(func.count(Notification.id)).where(Notification.user_id == current_user.id)
-        )
-        total_count = total_result.scalar() or 0
+        # Get total and unread counts in one aggregate query
+        result = await db.execute(_NOTIFICATION_COUNTS_BY_USER, {"user_id": current_user.id})
+        total_count, unread_count = result.one()
         
-        unread_result = await db.execute(
-            select(func.count(Notification.id)).where(
-                and_(
-                    Notification.user_id == current_user.id,
-                    Notification.read == False
-                )
-            )
-        )
-        unread_count = unread_result.scalar() or 0
+        # Versioned by the counts themselves: newest created_at alone would
+        # miss mark-as-read and deletes
+        etag = weak_etag(current_user.id, total_count, unread_count)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
         
         return {
             "total_notifications": total_count,
@@ -1,16 +1,23 @@
 """
 Organization management endpoints
 """
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import APIRouter, Depends, UploadFile, File, Query, HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, delete, exists, and_, func, bindparam
+from sqlalchemy.orm import aliased, raiseload
 
 from app.core.database import get_db
 from app.core.deps import get_current_active_user, require_admin, require_member, require_admin_by_path, require_member_by_path
 from app.core.exceptions import ValidationError, ResourceNotFoundError, InsufficientPermissionsError
-from app.core.cache import cache_response
+from app.core.cache import cache_response, invalidate_cache_pattern, invalidate_member_caches
+from app.core.uploads import IMAGE_FILE_TYPES, generate_upload_filename, stream_upload_to_disk
+from app.config import settings
 from app.models.user import User
 from app.models.organization import Organization, OrganizationMember
 from app.models.project import Project
@@ -19,13 +26,158 @@ from app.schemas.organization import (
     OrganizationMemberResponse, MemberInvite, MemberRoleUpdate,
     BillingInfo, SubscriptionInfo
 )
-from app.services.invitation_service import InvitationService
+from app.services.invitation_service import InvitationService, invalidate_invitation_domain_policy
+from app.services.enhanced_role_permissions import EnhancedRolePermissions
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_LOGO_SIZE = 5 * 1024 * 1024
+
+_ORGANIZATION_LIST_ADAPTER = TypeAdapter(List[OrganizationResponse])
+
+# Statements shared by the handlers below, built once at import and executed
+# with bind parameters ("org_id", "user_id")
+_MEMBER_ROLE = select(OrganizationMember.role).where(
+    OrganizationMember.organization_id == bindparam("org_id"),
+    OrganizationMember.user_id == bindparam("user_id")
+)
+_IS_MEMBER = select(
+    exists().where(
+        OrganizationMember.organization_id == bindparam("org_id"),
+        OrganizationMember.user_id == bindparam("user_id")
+    )
+)
+_ORGANIZATION_WITH_CALLER_ROLE = (
+    select(Organization, OrganizationMember.role)
+    .outerjoin(
+        OrganizationMember,
+        and_(
+            OrganizationMember.organization_id == Organization.id,
+            OrganizationMember.user_id == bindparam("user_id")
+        )
+    )
+    .where(Organization.id == bindparam("org_id"))
+    .options(raiseload("*"))
+)
+
+_caller_membership = aliased(OrganizationMember)
+_ORGANIZATION_DASHBOARD = (
+    select(
+        Organization,
+        _caller_membership.role,
+        select(func.count(Project.id))
+        .where(Project.organization_id == Organization.id)
+        .scalar_subquery(),
+        select(func.count(OrganizationMember.id))
+        .where(OrganizationMember.organization_id == Organization.id)
+        .scalar_subquery()
+    )
+    .outerjoin(
+        _caller_membership,
+        and_(
+            _caller_membership.organization_id == Organization.id,
+            _caller_membership.user_id == bindparam("user_id")
+        )
+    )
+    .where(Organization.id == bindparam("org_id"))
+    .options(raiseload("*"))
+)
+
+
+def _member_cache_key(organization_id: str, current_user: User, **_) -> str:
+    """Cache key for responses whose membership check runs inside the handler"""
+    return f"{organization_id}:{current_user.id}"
+
+
+async def require_owner_by_path(
+    organization_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+) -> None:
+    """Require the current user to own the organization in the path (role lookup is cached)"""
+    permissions = EnhancedRolePermissions(db)
+    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
+
+    logger.debug("User %s has role %s in org %s", current_user.id, user_role, organization_id)
+
+    if user_role != 'owner':
+        raise HTTPException(
+            status_code=403,
+            detail="This action is restricted to organization owners only"
+        )
+
+
+async def _get_organization_for_member(
+    db: AsyncSession,
+    organization_id: str,
+    user_id,
+    allowed_roles: Optional[List[str]] = None,
+    denied_message: str = "Not a member of this organization"
+) -> Organization:
+    """
+    Fetch an organization together with the caller's role in one round-trip
+
+    The LEFT OUTER JOIN keeps the organization row when the caller is not a
+    member, so a missing organization (404) can be told apart from a missing
+    or insufficient membership (403). Relationships raise on access.
+    """
+    result = await db.execute(
+        _ORGANIZATION_WITH_CALLER_ROLE, {"org_id": organization_id, "user_id": user_id}
+    )
+    row = result.first()
+    if row is None:
+        raise ResourceNotFoundError("Organization not found")
+
+    organization, role = row
+    if role is None or (allowed_roles and role not in allowed_roles):
+        raise InsufficientPermissionsError(denied_message)
+
+    return organization
+
+
+async def _get_member_role(db: AsyncSession, organization_id: str, user_id) -> Optional[str]:
+    """Look up a member's role as a plain column, without loading the entity"""
+    result = await db.execute(_MEMBER_ROLE, {"org_id": organization_id, "user_id": user_id})
+    return result.scalar_one_or_none()
+
+
+async def _update_organization_as_admin(
+    db: AsyncSession,
+    organization_id: str,
+    user_id,
+    values: dict,
+    *criteria
+) -> Optional[Organization]:
+    """
+    UPDATE an organization the caller administers and return the new row
+
+    Authorization is folded into the WHERE clause, so the happy path is a
+    single UPDATE ... RETURNING. Returns None when no row matched; callers
+    then use _get_organization_for_member to report 404 vs 403.
+    """
+    caller_is_admin = (
+        select(OrganizationMember.id)
+        .where(
+            OrganizationMember.organization_id == organization_id,
+            OrganizationMember.user_id == user_id,
+            OrganizationMember.role.in_(["admin", "owner"])
+        )
+        .exists()
+    )
+    result = await db.execute(
+        update(Organization)
+        .where(Organization.id == organization_id, caller_is_admin, *criteria)
+        .values(**values)
+        .returning(Organization),
+        execution_options={"synchronize_session": False, "populate_existing": True}
+    )
+    return result.scalar_one_or_none()
+
 
 @router.get("", response_model=List[OrganizationResponse])
-@cache_response(ttl=60, key_prefix="organizations")  # Cache for 1 minute
+@cache_response(ttl=60, key_prefix="organizations", stale_ttl=60)  # Fresh for 1 minute, stale-while-revalidate for 1 more
 async def get_organizations(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
@@ -33,18 +185,17 @@ async def get_organizations(
     """Get all organizations for current user with optimized query"""
     # Use a single optimized query with proper joins and indexes
     result = await db.execute(
-        select(Organization, OrganizationMember.role)
+        select(Organization)
         .join(OrganizationMember, Organization.id == OrganizationMember.organization_id)
         .where(OrganizationMember.user_id == current_user.id)
         .order_by(Organization.name)
+        .options(raiseload("*"))
     )
 
-    organizations = []
-    for org, _ in result.all():  # role not used currently
-        org_response = OrganizationResponse.model_validate(org)
-        organizations.append(org_response)
-
-    return organizations
+    # Validate the whole list in one pass rather than model by model
+    return _ORGANIZATION_LIST_ADAPTER.validate_python(
+        result.scalars().all(), from_attributes=True
+    )
 
 
 @router.post("", response_model=OrganizationResponse)
@@ -55,36 +206,39 @@ async def create_organization(
 ):
     """Create a new organization - Restricted access"""
     # Use enhanced RBAC to check organization creation permission
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions, Permission
-
     # For organization creation, we need to check if the user has global permission
     # Since this is creating a new organization, we check against any existing organization
     # where the user is an owner, or allow first-time organization creation for new users
 
-    existing_memberships = await db.execute(
-        select(OrganizationMember).where(OrganizationMember.user_id == current_user.id)
-    )
-    all_memberships = existing_memberships.scalars().all()
-
     # Implement stricter organization creation policy
     # Only allow organization creation for:
     # 1. New users with no existing memberships (first organization)
     # 2. Users who are owners in ALL their existing organizations
+    membership_result = await db.execute(
+        select(
+            func.bool_or(OrganizationMember.role != 'owner'),
+            func.count()
+        ).where(OrganizationMember.user_id == current_user.id)
+    )
+    has_non_owner_role, membership_count = membership_result.one()
 
-    if all_memberships:
-        # User has existing memberships - check if they have any non-owner roles
-        non_owner_roles = [m.role for m in all_memberships if m.role != 'owner']
-
-        # If user has any non-owner role (member, viewer, admin), deny creation
-        if non_owner_roles:
-            raise HTTPException(
-                status_code=403,
-                detail=f"Organization creation denied. Users with member, viewer, or admin roles cannot create organizations. Current roles: {[m.role for m in all_memberships]}"
-            )
+    # If user has any non-owner role (member, viewer, admin), deny creation
+    if membership_count and has_non_owner_role:
+        raise HTTPException(
+            status_code=403,
+            detail="Organization creation denied. Users with member, viewer, or admin roles cannot create organizations."
+        )
     # If user has no memberships, allow first organization creation (new user scenario)
 
+    # Generate the key and timestamps client-side so the organization, its
+    # owner membership and the sample project go out in one flush, and the
+    # response can be built without refreshing the row
+    organization_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+
     # Create organization
     organization = Organization(
+        id=organization_id,
         name=org_data.name,
         description=org_data.description,
         domain=org_data.domain,
@@ -99,24 +253,21 @@ async def create_organization(
         country=org_data.country,
         organization_category=org_data.organization_category,
         language=org_data.language,
-        created_by=current_user.id
+        created_by=current_user.id,
+        created_at=now,
+        updated_at=now
     )
-    
-    db.add(organization)
-    await db.flush()  # Get the ID
-    
+
     # Add creator as owner
     member = OrganizationMember(
-        organization_id=organization.id,
+        organization_id=organization_id,
         user_id=current_user.id,
         role="owner"
     )
-    
-    db.add(member)
 
     # Create a sample project for the new organization
     sample_project = Project(
-        organization_id=organization.id,
+        organization_id=organization_id,
         name="Welcome Project",
         description="Your first project to get started with Agno WorkSphere",
         status="active",
@@ -124,9 +275,8 @@ async def create_organization(
         created_by=current_user.id
     )
 
-    db.add(sample_project)
+    db.add_all([organization, member, sample_project])
     await db.commit()
-    await db.refresh(organization)
 
     return OrganizationResponse.from_orm(organization)
 
@@ -138,24 +288,8 @@ async def get_organization(
     db: AsyncSession = Depends(get_db)
 ):
     """Get organization by ID"""
-    # Check if user is member
-    member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
-    )
-    if not member_result.scalar_one_or_none():
-        raise InsufficientPermissionsError("Not a member of this organization")
-    
-    # Get organization
-    result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
-    )
-    organization = result.scalar_one_or_none()
-    if not organization:
-        raise ResourceNotFoundError("Organization not found")
-    
+    organization = await _get_organization_for_member(db, organization_id, current_user.id)
+
     return OrganizationResponse.from_orm(organization)
 
 
@@ -164,68 +298,29 @@ async def update_organization(
     organization_id: str,
     org_data: OrganizationUpdate,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Update organization"""
-    result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
-    )
-    organization = result.scalar_one_or_none()
-    if not organization:
-        raise ResourceNotFoundError("Organization not found")
-    
-    # Update fields if provided
-    if org_data.name is not None:
-        organization.name = org_data.name
-    if org_data.description is not None:
-        organization.description = org_data.description
-    if org_data.domain is not None:
-        organization.domain = org_data.domain
-    if org_data.allowed_domains is not None:
-        organization.allowed_domains = org_data.allowed_domains
-    if org_data.contact_email is not None:
-        organization.contact_email = org_data.contact_email
-    if org_data.contact_phone is not None:
-        organization.contact_phone = org_data.contact_phone
-    if org_data.address_line1 is not None:
-        organization.address_line1 = org_data.address_line1
-    if org_data.address_line2 is not None:
-        organization.address_line2 = org_data.address_line2
-    if org_data.city is not None:
-        organization.city = org_data.city
-    if org_data.state is not None:
-        organization.state = org_data.state
-    if org_data.postal_code is not None:
-        organization.postal_code = org_data.postal_code
-    if org_data.country is not None:
-        organization.country = org_data.country
-    if org_data.organization_category is not None:
-        organization.organization_category = org_data.organization_category
-    if org_data.allowed_domains is not None:
-        organization.allowed_domains = org_data.allowed_domains
-    if org_data.contact_email is not None:
-        organization.contact_email = org_data.contact_email
-    if org_data.contact_phone is not None:
-        organization.contact_phone = org_data.contact_phone
-    if org_data.address_line1 is not None:
-        organization.address_line1 = org_data.address_line1
-    if org_data.address_line2 is not None:
-        organization.address_line2 = org_data.address_line2
-    if org_data.city is not None:
-        organization.city = org_data.city
-    if org_data.state is not None:
-        organization.state = org_data.state
-    if org_data.postal_code is not None:
-        organization.postal_code = org_data.postal_code
-    if org_data.country is not None:
-        organization.country = org_data.country
-    if org_data.organization_category is not None:
-        organization.organization_category = org_data.organization_category
-    
+    values = org_data.model_dump(exclude_unset=True, exclude_none=True)
+
+    organization = None
+    if values:
+        organization = await _update_organization_as_admin(
+            db, organization_id, current_user.id, values
+        )
+
+    if organization is None:
+        # Nothing to update, or no row matched: resolve 404 vs 403
+        organization = await _get_organization_for_member(
+            db, organization_id, current_user.id,
+            allowed_roles=["admin", "owner"],
+            denied_message="Organization admin or owner role required"
+        )
+
     await db.commit()
-    await db.refresh(organization)
-    
+    invalidate_cache_pattern(f"dashboard:{organization_id}:")
+    invalidate_invitation_domain_policy(organization_id)
+
     return OrganizationResponse.from_orm(organization)
 
 
@@ -236,28 +331,34 @@ async def delete_organization(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete organization (owner only)"""
-    # Check if user is owner
-    member_result = await db.execute(
-        select(OrganizationMember).where(
+    caller_is_owner = (
+        select(OrganizationMember.id)
+        .where(
             OrganizationMember.organization_id == organization_id,
             OrganizationMember.user_id == current_user.id,
             OrganizationMember.role == "owner"
         )
+        .exists()
     )
-    if not member_result.scalar_one_or_none():
-        raise InsufficientPermissionsError("Only organization owner can delete organization")
-    
-    # Get organization
+
+    # Single DELETE; ON DELETE CASCADE/SET NULL foreign keys handle members,
+    # projects, settings and the rest in the database
     result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
+        delete(Organization)
+        .where(Organization.id == organization_id, caller_is_owner)
+        .returning(Organization.id),
+        execution_options={"synchronize_session": False}
     )
-    organization = result.scalar_one_or_none()
-    if not organization:
-        raise ResourceNotFoundError("Organization not found")
-    
-    # Delete organization (cascade will handle members, projects, etc.)
-    await db.delete(organization)
+    if result.scalar_one_or_none() is None:
+        # Resolve 404 vs 403 only when nothing was deleted
+        await _get_organization_for_member(
+            db, organization_id, current_user.id,
+            allowed_roles=["owner"],
+            denied_message="Only organization owner can delete organization"
+        )
+
     await db.commit()
+    invalidate_member_caches(organization_id)
     
     return {"success": True, "message": "Organization deleted successfully"}
 
@@ -267,30 +368,43 @@ async def upload_logo(
     organization_id: str,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload organization logo"""
     # Validate file type
-    if not file.content_type.startswith('image/'):
+    if not file.content_type or not file.content_type.startswith('image/'):
         raise ValidationError("File must be an image")
     
-    # Validate file size (max 5MB)
-    if file.size > 5 * 1024 * 1024:
+    # Validate file size (max 5MB); also enforced while streaming, since
+    # file.size is not known for chunked uploads
+    if file.size is not None and file.size > MAX_LOGO_SIZE:
         raise ValidationError("File size must be less than 5MB")
     
-    # TODO: Upload to S3 or local storage
-    logo_url = f"/uploads/organizations/{organization_id}/logo/{file.filename}"
+    filename = generate_upload_filename(file.filename or "", IMAGE_FILE_TYPES)
+    logo_url = f"/uploads/organizations/{organization_id}/logo/{filename}"
     
-    # Update organization logo URL
-    result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
+    # Update organization logo URL first so nothing is written to disk for a
+    # caller without access; a failed write below rolls the update back
+    organization = await _update_organization_as_admin(
+        db, organization_id, current_user.id, {"logo_url": logo_url}
     )
-    organization = result.scalar_one_or_none()
-    if not organization:
+    if organization is None:
+        await _get_organization_for_member(
+            db, organization_id, current_user.id,
+            allowed_roles=["admin", "owner"],
+            denied_message="Organization admin or owner role required"
+        )
         raise ResourceNotFoundError("Organization not found")
-    
-    organization.logo_url = logo_url
+
+    # TODO: Upload to S3 when object storage is configured
+    file_path = os.path.join(
+        settings.upload_directory, "organizations", str(organization.id), "logo", filename
+    )
+    await stream_upload_to_disk(
+        file, file_path, MAX_LOGO_SIZE,
+        too_large_message="File size must be less than 5MB"
+    )
+
     await db.commit()
     
     return {
@@ -306,30 +420,35 @@ async def upload_logo(
 async def delete_logo(
     organization_id: str,
     current_user: User = Depends(get_current_active_user),
-    org_member: OrganizationMember = Depends(require_admin_by_path),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete organization logo"""
-    result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
-    )
-    organization = result.scalar_one_or_none()
-    if not organization:
-        raise ResourceNotFoundError("Organization not found")
-    
-    if not organization.logo_url:
-        raise ResourceNotFoundError("No logo to delete")
-    
     # TODO: Delete file from storage
-    
+
     # Remove logo URL
-    organization.logo_url = None
+    organization = await _update_organization_as_admin(
+        db, organization_id, current_user.id, {"logo_url": None},
+        Organization.logo_url.isnot(None)
+    )
+    if organization is None:
+        await _get_organization_for_member(
+            db, organization_id, current_user.id,
+            allowed_roles=["admin", "owner"],
+            denied_message="Organization admin or owner role required"
+        )
+        raise ResourceNotFoundError("No logo to delete")
+
     await db.commit()
     
     return {"success": True, "message": "Logo deleted successfully"}
 
 
 @router.get("/{organization_id}/members", response_model=List[OrganizationMemberResponse])
+@cache_response(
+    ttl=60, key_prefix="members", stale_ttl=60,
+    # Membership is enforced by the dependency, so pages are shared per organization
+    key_builder=lambda organization_id, page, limit, **_: f"{organization_id}:{page}:{limit}"
+)
 async def get_members(
     organization_id: str,
     page: int = Query(1, ge=1),
@@ -341,30 +460,41 @@ async def get_members(
     """Get organization members"""
     offset = (page - 1) * limit
 
-    result = await db.execute(
-        select(OrganizationMember)
-        .options(selectinload(OrganizationMember.user))
+    # Join users directly and project only the columns the response needs;
+    # rows are streamed straight into response models, fetched in one batch
+    result = await db.stream(
+        select(
+            OrganizationMember.id,
+            OrganizationMember.user_id,
+            OrganizationMember.role,
+            OrganizationMember.joined_at,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.avatar_url
+        )
+        .join(User, User.id == OrganizationMember.user_id)
         .where(OrganizationMember.organization_id == organization_id)
+        .order_by(OrganizationMember.joined_at)
         .offset(offset)
         .limit(limit)
-        .order_by(OrganizationMember.joined_at)
+        .execution_options(yield_per=limit)
     )
-    members = result.scalars().all()
 
     # Format response with user details
     response = []
-    for member in members:
+    async for row in result.mappings():
         member_data = OrganizationMemberResponse(
-            id=str(member.id),
-            user_id=str(member.user_id),
-            role=member.role,
-            joined_at=member.joined_at,
+            id=str(row["id"]),
+            user_id=str(row["user_id"]),
+            role=row["role"],
+            joined_at=row["joined_at"],
             user={
-                "id": str(member.user.id),
-                "email": member.user.email,
-                "first_name": member.user.first_name,
-                "last_name": member.user.last_name,
-                "avatar_url": member.user.avatar_url
+                "id": str(row["user_id"]),
+                "email": row["email"],
+                "first_name": row["first_name"],
+                "last_name": row["last_name"],
+                "avatar_url": row["avatar_url"]
             }
         )
         response.append(member_data)
@@ -383,30 +513,28 @@ async def invite_member(
     """Invite member to organization"""
     # Check if user already exists
     user_result = await db.execute(
-        select(User).where(User.email == invite_data.email)
+        select(User.id).where(User.email == invite_data.email)
     )
-    user = user_result.scalar_one_or_none()
+    user_id = user_result.scalar_one_or_none()
 
-    if user:
+    if user_id:
         # Check if already a member
         member_result = await db.execute(
-            select(OrganizationMember).where(
-                OrganizationMember.organization_id == organization_id,
-                OrganizationMember.user_id == user.id
-            )
+            _IS_MEMBER, {"org_id": organization_id, "user_id": user_id}
         )
-        if member_result.scalar_one_or_none():
+        if member_result.scalar():
             raise ValidationError("User is already a member of this organization")
 
         # Add as member
         member = OrganizationMember(
             organization_id=organization_id,
-            user_id=user.id,
+            user_id=user_id,
             role=invite_data.role,
             invited_by=current_user.id
         )
         db.add(member)
         await db.commit()
+        invalidate_member_caches(organization_id, user_id)
 
         return {"success": True, "message": "User added to organization successfully"}
     else:
@@ -430,23 +558,24 @@ async def remove_member(
     db: AsyncSession = Depends(get_db)
 ):
     """Remove member from organization"""
-    # Cannot remove owner
-    member_result = await db.execute(
-        select(OrganizationMember).where(
+    # Cannot remove owner; the role guard is part of the DELETE itself
+    result = await db.execute(
+        delete(OrganizationMember)
+        .where(
             OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == user_id
+            OrganizationMember.user_id == user_id,
+            OrganizationMember.role != "owner"
         )
+        .returning(OrganizationMember.id),
+        execution_options={"synchronize_session": False}
     )
-    member = member_result.scalar_one_or_none()
-    if not member:
-        raise ResourceNotFoundError("Member not found")
-
-    if member.role == "owner":
+    if result.scalar_one_or_none() is None:
+        if await _get_member_role(db, organization_id, user_id) is None:
+            raise ResourceNotFoundError("Member not found")
         raise ValidationError("Cannot remove organization owner")
 
-    # Remove member
-    await db.delete(member)
     await db.commit()
+    invalidate_member_caches(organization_id, user_id)
 
     return {"success": True, "message": "Member removed successfully"}
 
@@ -461,28 +590,31 @@ async def update_member_role(
     db: AsyncSession = Depends(get_db)
 ):
     """Update member role"""
-    # Get member
-    member_result = await db.execute(
-        select(OrganizationMember).where(
+    # Cannot assign owner role unless you are owner
+    if role_data.role == "owner" and org_member.role != "owner":
+        raise InsufficientPermissionsError("Only owner can assign owner role")
+
+    # Update role; only an owner may change another owner's role
+    stmt = (
+        update(OrganizationMember)
+        .where(
             OrganizationMember.organization_id == organization_id,
             OrganizationMember.user_id == user_id
         )
+        .values(role=role_data.role)
+        .returning(OrganizationMember.role)
     )
-    member = member_result.scalar_one_or_none()
-    if not member:
-        raise ResourceNotFoundError("Member not found")
+    if org_member.role != "owner":
+        stmt = stmt.where(OrganizationMember.role != "owner")
 
-    # Cannot change owner role unless you are owner
-    if member.role == "owner" and org_member.role != "owner":
+    result = await db.execute(stmt, execution_options={"synchronize_session": False})
+    if result.scalar_one_or_none() is None:
+        if await _get_member_role(db, organization_id, user_id) is None:
+            raise ResourceNotFoundError("Member not found")
         raise InsufficientPermissionsError("Only owner can change owner role")
 
-    # Cannot assign owner role unless you are owner
-    if role_data.role == "owner" and org_member.role != "owner":
-        raise InsufficientPermissionsError("Only owner can assign owner role")
-
-    # Update role
-    member.role = role_data.role
     await db.commit()
+    invalidate_member_caches(organization_id, user_id)
 
     return {"success": True, "message": "Member role updated successfully"}
 
@@ -490,24 +622,9 @@ async def update_member_role(
 @router.get("/{organization_id}/billing", response_model=BillingInfo)
 async def get_billing(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Get billing information - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    print(f"DEBUG: User {current_user.id} has role '{user_role}' in org {organization_id}")  # Debug line
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Get from database
     return BillingInfo()
 
@@ -516,22 +633,9 @@ async def get_billing(
 async def update_billing(
     organization_id: str,
     billing_data: BillingInfo,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Update billing information - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Store in database
     return billing_data
 
@@ -539,22 +643,9 @@ async def update_billing(
 @router.get("/{organization_id}/subscription", response_model=SubscriptionInfo)
 async def get_subscription(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Get subscription information - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Get from database
     return SubscriptionInfo(plan="free", status="active")
 
@@ -563,22 +654,9 @@ async def get_subscription(
 async def update_subscription(
     organization_id: str,
     subscription_data: SubscriptionInfo,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Update subscription information - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Store in database and handle billing
     return subscription_data
 
@@ -586,22 +664,9 @@ async def update_subscription(
 @router.get("/{organization_id}/payment-methods")
 async def get_payment_methods(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Get payment methods - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Get from database
     return {"payment_methods": []}
 
@@ -610,22 +675,9 @@ async def get_payment_methods(
 async def add_payment_method(
     organization_id: str,
     payment_data: dict,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Add payment method - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Store in database
     return {"message": "Payment method added successfully"}
 
@@ -633,22 +685,9 @@ async def add_payment_method(
 @router.get("/{organization_id}/usage")
 async def get_usage(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Get usage statistics - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Get from database
     return {"usage": {}}
 
@@ -656,68 +695,38 @@ async def get_usage(
 @router.get("/{organization_id}/quotas")
 async def get_quotas(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Get quota information - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Get from database
     return {"quotas": {}}
 
 
 @router.get("/{organization_id}/dashboard")
+@cache_response(ttl=60, key_prefix="dashboard", stale_ttl=60, key_builder=_member_cache_key)
 async def get_organization_dashboard(
     organization_id: str,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get organization dashboard data"""
-    # Check if user is member of the organization
-    member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
+    # Membership, organization and both counts in a single round-trip
+    result = await db.execute(
+        _ORGANIZATION_DASHBOARD, {"org_id": organization_id, "user_id": current_user.id}
     )
-    member = member_result.scalar_one_or_none()
+    row = result.first()
+
+    if row is None:
+        raise ResourceNotFoundError("Organization not found")
+
+    organization, member_role, projects_count, members_count = row
 
-    if not member:
+    if member_role is None:
         raise HTTPException(
             status_code=403,
             detail="Access denied. You are not a member of this organization."
         )
 
-    # Get organization data
-    org_result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
-    )
-    organization = org_result.scalar_one_or_none()
-
-    if not organization:
-        raise ResourceNotFoundError("Organization not found")
-
-    # Get basic stats
-    projects_result = await db.execute(
-        select(Project).where(Project.organization_id == organization_id)
-    )
-    projects_count = len(projects_result.scalars().all())
-
-    members_result = await db.execute(
-        select(OrganizationMember).where(OrganizationMember.organization_id == organization_id)
-    )
-    members_count = len(members_result.scalars().all())
-
     return {
         "id": organization.id,
         "name": organization.name,
@@ -731,6 +740,7 @@ async def get_organization_dashboard(
 
 
 @router.get("/{organization_id}/integrations")
+@cache_response(ttl=120, key_prefix="integrations", stale_ttl=120, key_builder=_member_cache_key)
 async def get_organization_integrations(
     organization_id: str,
     current_user: User = Depends(get_current_active_user),
@@ -739,14 +749,10 @@ async def get_organization_integrations(
     """Get organization integrations"""
     # Check if user is member of the organization
     member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
+        _IS_MEMBER, {"org_id": organization_id, "user_id": current_user.id}
     )
-    member = member_result.scalar_one_or_none()
 
-    if not member:
+    if not member_result.scalar():
         raise HTTPException(
             status_code=403,
             detail="Access denied. You are not a member of this organization."
@@ -758,6 +764,7 @@ async def get_organization_integrations(
 
 
 @router.get("/{organization_id}/activities")
+@cache_response(ttl=120, key_prefix="activities", stale_ttl=120, key_builder=_member_cache_key)
 async def get_recent_activities(
     organization_id: str,
     current_user: User = Depends(get_current_active_user),
@@ -766,14 +773,10 @@ async def get_recent_activities(
     """Get recent organization activities"""
     # Check if user is member of the organization
     member_result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == organization_id,
-            OrganizationMember.user_id == current_user.id
-        )
+        _IS_MEMBER, {"org_id": organization_id, "user_id": current_user.id}
     )
-    member = member_result.scalar_one_or_none()
 
-    if not member:
+    if not member_result.scalar():
         raise HTTPException(
             status_code=403,
             detail="Access denied. You are not a member of this organization."
@@ -787,21 +790,8 @@ async def get_recent_activities(
 @router.get("/{organization_id}/billing/notifications")
 async def get_billing_notifications(
     organization_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    _owner: None = Depends(require_owner_by_path)
 ):
     """Get billing notifications - Owner only"""
-    # Check if user is owner of the organization
-    from app.services.enhanced_role_permissions import EnhancedRolePermissions
-    permissions = EnhancedRolePermissions(db)
-
-    user_role = await permissions.get_user_role(str(current_user.id), organization_id)
-
-    if user_role != 'owner':
-        raise HTTPException(
-            status_code=403,
-            detail="Billing access is restricted to organization owners only"
-        )
-
     # TODO: Get from database
     return {"notifications": []}
@@ -19,7 +19,7 @@ from app.models.organization import Organization, OrganizationMember
 from app.models.organization_settings import OrganizationSettings, UserOrganizationContext, InvitationToken
 from app.models.project import Project
 from app.services.organization_service import OrganizationService
-from app.services.invitation_service import InvitationService
+from app.services.invitation_service import InvitationService, invalidate_invitation_domain_policy
 from app.schemas.organization import OrganizationCreate
 from app.schemas.organization_enhanced import (
     OrganizationListResponse, EnhancedOrganizationResponse, OrganizationSwitchRequest,
@@ -246,6 +246,7 @@ async def update_organization_settings(
     
     await db.commit()
     await db.refresh(settings)
+    invalidate_invitation_domain_policy(organization_id)
     
     return settings
 
@@ -1,69 +1,139 @@
 """
 User management endpoints
 """
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import hashlib
+import os
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, bindparam
 
+from app.config import settings
+from app.core.cache import cache, cache_response, invalidate_cache_pattern
 from app.core.database import get_db
 from app.core.deps import get_current_active_user
 from app.core.exceptions import ValidationError, ResourceNotFoundError
+from app.core.http_cache import weak_etag, etag_matches, set_etag, not_modified
+from app.core.uploads import IMAGE_FILE_TYPES, generate_upload_filename, stream_upload_to_disk
 from app.models.user import User
 from app.models.organization import Organization, OrganizationMember
 from app.schemas.user import UserProfile, UserProfileUpdate, UserProfileWithRole, UserOrganizationInfo, NotificationPreferences, NotificationPreferencesUpdate
 from app.schemas.auth import UserResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5MB
+
+# Statements shared by the handlers below, built once at import and executed
+# with the "user_id" bind parameter
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USER_ORGANIZATIONS = (
+    select(Organization.id, Organization.name, OrganizationMember.role)
+    .join(Organization, Organization.id == OrganizationMember.organization_id)
+    .where(OrganizationMember.user_id == bindparam("user_id"))
+    .order_by(OrganizationMember.joined_at)
+)
+# Same rows plus each organization's updated_at, which versions the /me ETag
+_USER_ORGANIZATIONS_VERSIONED = _USER_ORGANIZATIONS.add_columns(Organization.updated_at)
+
+# Notification preferences are stored on the user row; the cache is only a
+# read-through layer. It is per worker, so other workers may serve the previous
+# preferences for up to this many seconds after an update
+NOTIFICATION_PREFERENCES_TTL = 60
+
+
+def _user_profile_cache_key(user_id: uuid.UUID, **_) -> str:
+    """Cache key for another user's public profile"""
+    return f"{user_id}:profile"
+
+
+def _notification_preferences_key(user_id) -> str:
+    """Cache key for a user's notification preferences (kept out of the user:{id}: namespace)"""
+    return f"notification_prefs:{user_id}"
+
+
+def _invalidate_user_cache(user_id) -> None:
+    """Drop cached profile responses after the user's profile changes"""
+    invalidate_cache_pattern(f"user:{user_id}:")
+
+
+# Profile fields copied straight off a trusted ORM row; resolved once at
+# import from the schema so the two cannot drift apart
+_USER_FIELDS = tuple(UserProfile.model_fields)
+
+
+def _build_profile(user: User) -> UserProfile:
+    """Build a UserProfile from an ORM row without re-validating it"""
+    return UserProfile.model_construct(**{field: getattr(user, field) for field in _USER_FIELDS})
+
+
+def _build_user_with_role(
+    user: User,
+    role: Optional[str],
+    organizations: List[UserOrganizationInfo],
+    current_organization_id
+) -> UserProfileWithRole:
+    """Build a UserProfileWithRole from an ORM row without re-validating it"""
+    return UserProfileWithRole.model_construct(
+        **{field: getattr(user, field) for field in _USER_FIELDS},
+        role=role,
+        organizations=organizations,
+        current_organization_id=current_organization_id
+    )
+
+
+def _profile_etag(user: User) -> str:
+    """ETag for a profile response, versioned by the user row's updated_at"""
+    return weak_etag(user.id, user.updated_at.timestamp())
+
+
+def _me_etag(user: User, memberships) -> str:
+    """ETag for /me, also covering membership roles and organization renames"""
+    version = hashlib.md5(
+        "|".join(
+            f"{row.id}:{row.role}:{row.updated_at.timestamp()}"
+            for row in memberships
+        ).encode()
+    ).hexdigest()[:12]
+    return weak_etag(user.id, user.updated_at.timestamp(), version)
 
 
 @router.get("/me", response_model=UserProfileWithRole)
 async def get_current_user(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user profile with role and organization information"""
-    # Get user's organization memberships
-    result = await db.execute(
-        select(OrganizationMember)
-        .where(OrganizationMember.user_id == current_user.id)
-    )
-    memberships = result.scalars().all()
-
-    # Build organization info list
-    organizations = []
-    current_role = None
-    current_org_id = None
-
-    for membership in memberships:
-        # Load organization details
-        org_result = await db.execute(
-            select(Organization)
-            .where(Organization.id == membership.organization_id)
-        )
-        org = org_result.scalar_one_or_none()
-
-        if org:
-            org_info = UserOrganizationInfo(
-                id=org.id,
-                name=org.name,
-                role=membership.role
-            )
-            organizations.append(org_info)
-
-            # Use the first organization as current (or you could implement logic to determine current org)
-            if current_role is None:
-                current_role = membership.role
-                current_org_id = org.id
-
-    # Create response with role information
-    user_data = UserProfile.from_orm(current_user)
-
-    return UserProfileWithRole(
-        **user_data.dict(),
-        role=current_role or "owner",  # Default to owner if no role found
-        organizations=organizations,
-        current_organization_id=current_org_id
+    # Memberships are read per request (ordered by join date): current_user
+    # may come from the session cache, whose memberships can be out of date
+    result = await db.execute(_USER_ORGANIZATIONS_VERSIONED, {"user_id": current_user.id})
+    memberships = result.all()
+
+    etag = _me_etag(current_user, memberships)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    organizations = [
+        UserOrganizationInfo.model_construct(id=row.id, name=row.name, role=row.role)
+        for row in memberships
+    ]
+
+    # The first organization is the current one; its role is the user's role
+    current = memberships[0] if memberships else None
+
+    # Create response with role information; the source is a loaded ORM row,
+    # so validation is skipped
+    return _build_user_with_role(
+        current_user,
+        current.role if current else "owner",  # Default to owner if no role found
+        organizations,
+        current.id if current else None
     )
 
 
@@ -74,8 +144,9 @@ async def update_current_user(
     db: AsyncSession = Depends(get_db)
 ):
     """Update current user profile (alias for /profile)"""
-    # Get the user from the database to ensure it's attached to this session
-    result = await db.execute(select(User).where(User.id == current_user.id))
+    # current_user may be the detached, shared graph cached by SessionService,
+    # so load this session's own copy to update
+    result = await db.execute(_USER_BY_ID, {"user_id": current_user.id})
     db_user = result.scalar_one_or_none()
     if not db_user:
         raise ResourceNotFoundError("User not found")
@@ -88,72 +159,41 @@ async def update_current_user(
 
     await db.commit()
     await db.refresh(db_user)
+    _invalidate_user_cache(db_user.id)
 
-    # Get user's organizations and role
-    org_member_result = await db.execute(
-        select(OrganizationMember)
-        .options(selectinload(OrganizationMember.organization))
-        .where(OrganizationMember.user_id == db_user.id)
-    )
-    org_members = org_member_result.scalars().all()
+    # Get user's organizations and role; only three columns are needed, so
+    # rows are read as mappings instead of hydrating ORM instances
+    org_member_result = await db.execute(_USER_ORGANIZATIONS, {"user_id": db_user.id})
 
     # Get current organization (first one for now)
     current_org_id = None
     role = 'member'
     organizations = []
 
-    for org_member in org_members:
-        org_info = {
-            "id": org_member.organization.id,
-            "name": org_member.organization.name,
-            "role": org_member.role,
-            "joined_at": org_member.created_at.isoformat()
-        }
-        organizations.append(org_info)
+    for row in org_member_result.mappings():
+        organizations.append(UserOrganizationInfo.model_construct(**row))
 
         # Set role from first organization
         if current_org_id is None:
-            current_org_id = org_member.organization.id
-            role = org_member.role
-
-    return UserProfileWithRole(
-        id=db_user.id,
-        email=db_user.email,
-        first_name=db_user.first_name,
-        last_name=db_user.last_name,
-        avatar_url=db_user.avatar_url,
-        email_verified=db_user.email_verified,
-        two_factor_enabled=db_user.two_factor_enabled,
-        last_login_at=db_user.last_login_at,
-        created_at=db_user.created_at,
-        updated_at=db_user.updated_at,
-        role=role,
-        organizations=organizations,
-        current_organization_id=current_org_id
-    )
+            current_org_id = row["id"]
+            role = row["role"]
 
-
-@router.get("/{user_id}", response_model=UserProfile)
-async def get_user_by_id(
-    user_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get user by ID"""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise ResourceNotFoundError("User not found")
-
-    return UserProfile.from_orm(user)
+    return _build_user_with_role(db_user, role, organizations, current_org_id)
 
 
 @router.get("/profile", response_model=UserProfile)
 async def get_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user)
 ):
     """Get current user profile"""
-    return UserProfile.from_orm(current_user)
+    etag = _profile_etag(current_user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return _build_profile(current_user)
 
 
 @router.put("/profile", response_model=UserProfile)
@@ -171,8 +211,9 @@ async def update_profile(
     
     await db.commit()
     await db.refresh(current_user)
+    _invalidate_user_cache(current_user.id)
     
-    return UserProfile.from_orm(current_user)
+    return _build_profile(current_user)
 
 
 @router.post("/avatar")
@@ -183,20 +224,30 @@ async def upload_avatar(
 ):
     """Upload user avatar"""
     # Validate file type
-    if not file.content_type.startswith('image/'):
+    if not file.content_type or not file.content_type.startswith('image/'):
         raise ValidationError("File must be an image")
     
-    # Validate file size (max 5MB)
-    if file.size > 5 * 1024 * 1024:
+    # Validate file size (max 5MB); also enforced while streaming, since
+    # file.size is not known for chunked uploads
+    if file.size is not None and file.size > MAX_AVATAR_SIZE:
         raise ValidationError("File size must be less than 5MB")
     
-    # TODO: Upload to S3 or local storage
-    # For now, just return a mock URL
-    avatar_url = f"/uploads/avatars/{current_user.id}/{file.filename}"
+    # TODO: Upload to S3 when object storage is configured
+    filename = generate_upload_filename(file.filename or "", IMAGE_FILE_TYPES)
+    avatar_url = f"/uploads/avatars/{current_user.id}/{filename}"
+    file_path = os.path.join(settings.upload_directory, "avatars", str(current_user.id), filename)
+    await stream_upload_to_disk(
+        file, file_path, MAX_AVATAR_SIZE,
+        too_large_message="File size must be less than 5MB"
+    )
     
-    # Update user avatar URL
-    current_user.avatar_url = avatar_url
+    # Update user avatar URL with a single-column UPDATE (no ORM flush)
+    await db.execute(
+        update(User).where(User.id == current_user.id).values(avatar_url=avatar_url),
+        execution_options={"synchronize_session": False}
+    )
     await db.commit()
+    _invalidate_user_cache(current_user.id)
     
     return {
         "success": True,
@@ -213,14 +264,21 @@ async def delete_avatar(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete user avatar"""
-    if not current_user.avatar_url:
-        raise ResourceNotFoundError("No avatar to delete")
-    
     # TODO: Delete file from storage
     
-    # Remove avatar URL
-    current_user.avatar_url = None
+    # Remove avatar URL; no row matches when there is no avatar to delete
+    result = await db.execute(
+        update(User)
+        .where(User.id == current_user.id, User.avatar_url.isnot(None))
+        .values(avatar_url=None)
+        .returning(User.id),
+        execution_options={"synchronize_session": False}
+    )
+    if result.scalar_one_or_none() is None:
+        raise ResourceNotFoundError("No avatar to delete")
+
     await db.commit()
+    _invalidate_user_cache(current_user.id)
     
     return {
         "success": True,
@@ -230,11 +288,21 @@ async def delete_avatar(
 
 @router.get("/notifications/preferences", response_model=NotificationPreferences)
 async def get_notification_preferences(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get user notification preferences"""
-    # TODO: Get from database or return defaults
-    return NotificationPreferences()
+    cache_key = _notification_preferences_key(current_user.id)
+    stored = cache.get(cache_key)
+    if stored is None:
+        overrides = await db.scalar(
+            select(User.notification_preferences).where(User.id == current_user.id)
+        )
+        stored = {**NotificationPreferences().model_dump(), **(overrides or {})}
+        cache.set(cache_key, stored, NOTIFICATION_PREFERENCES_TTL)
+
+    # Stored values were validated when they were written
+    return NotificationPreferences.model_construct(**stored)
 
 
 @router.put("/notifications/preferences", response_model=NotificationPreferences)
@@ -244,9 +312,24 @@ async def update_notification_preferences(
     db: AsyncSession = Depends(get_db)
 ):
     """Update user notification preferences"""
-    # TODO: Store in database
-    # For now, just return the updated preferences
-    return NotificationPreferences()
+    # Row lock so concurrent updates merge instead of overwriting each other
+    overrides = await db.scalar(
+        select(User.notification_preferences)
+        .where(User.id == current_user.id)
+        .with_for_update()
+    )
+    overrides = {**(overrides or {}), **preferences.model_dump(exclude_none=True)}
+    await db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(notification_preferences=overrides)
+    )
+    await db.commit()
+
+    stored = {**NotificationPreferences().model_dump(), **overrides}
+    cache.set(_notification_preferences_key(current_user.id), stored, NOTIFICATION_PREFERENCES_TTL)
+
+    return NotificationPreferences.model_construct(**stored)
 
 
 @router.delete("/account")
@@ -262,3 +345,22 @@ async def delete_account(
         "success": True,
         "message": "Account deletion initiated. You will receive a confirmation email."
     }
+
+
+# Registered last so the catch-all path does not shadow /profile
+@router.get("/{user_id}", response_model=UserProfile)
+@cache_response(ttl=60, key_prefix="user", stale_ttl=60, key_builder=_user_profile_cache_key)
+async def get_user_by_id(
+    user_id: uuid.UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get user by ID"""
+    # FastAPI parses the path into a UUID, which asyncpg binds with the binary
+    # uuid codec so the primary key index is used directly
+    result = await db.execute(_USER_BY_ID, {"user_id": user_id})
+    user = result.scalar_one_or_none()
+    if not user:
+        raise ResourceNotFoundError("User not found")
+
+    return _build_profile(user)
@@ -25,6 +25,11 @@ class Settings:
         self.db_pool_max_size = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
         self.db_pool_max_queries = int(os.getenv("DB_POOL_MAX_QUERIES", "50000"))
         self.db_pool_max_inactive_time = int(os.getenv("DB_POOL_MAX_INACTIVE_TIME", "300"))
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "20"))  # SQLAlchemy engine pool
+        self.db_pool_max_overflow = int(os.getenv("DB_POOL_MAX_OVERFLOW", "40"))
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+        self.db_pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a connection
+        self.db_statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))  # per connection, asyncpg only
 
         # Redis Settings
         self.redis_max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
@@ -39,8 +44,13 @@ class Settings:
         self.refresh_token_expires_in = int(os.getenv("REFRESH_TOKEN_EXPIRES_IN", "7"))  # days
 
         # Security
-        self.bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+        self.bcrypt_rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))  # also the floor for calibration
+        self.password_hash_target_ms = int(os.getenv("PASSWORD_HASH_TARGET_MS", "0"))  # 0 disables calibration
         self.password_min_length = int(os.getenv("PASSWORD_MIN_LENGTH", "8"))
+        # Argon2id cost for one-time invitation passwords (OWASP: 64 MiB, t=3, p=2)
+        self.argon2_memory_cost = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+        self.argon2_time_cost = int(os.getenv("ARGON2_TIME_COST", "3"))
+        self.argon2_parallelism = int(os.getenv("ARGON2_PARALLELISM", "2"))
 
         # CORS - configure for dev and prod
         origins_str = os.getenv("ALLOWED_ORIGINS", "")
@@ -63,6 +73,10 @@ class Settings:
         self.smtp_pass = os.getenv("SMTP_PASS", "")
         self.from_email = os.getenv("FROM_EMAIL", "noreply@agno-worksphere.com")
         self.from_name = os.getenv("FROM_NAME", "Agno WorkSphere")
+        self.smtp_pool_size = int(os.getenv("SMTP_POOL_SIZE", "5"))
+        self.smtp_max_messages_per_connection = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+        self.email_dedupe_ttl = int(os.getenv("EMAIL_DEDUPE_TTL", "60"))  # 0 disables
+        self.email_queue_max_size = int(os.getenv("EMAIL_QUEUE_MAX_SIZE", "1000"))  # 0 is unbounded
 
         # File Upload
         self.max_file_size = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
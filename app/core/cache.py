@@ -1,13 +1,17 @@
 """
 Simple in-memory caching for API responses
 """
+import asyncio
+import logging
 import time
 import json
 import hashlib
-from typing import Any, Optional, Dict
+from typing import Any, Callable, Optional, Dict, Set
 from functools import wraps
 from fastapi import Request
 
+logger = logging.getLogger(__name__)
+
 class SimpleCache:
     """Simple in-memory cache with TTL support"""
     
@@ -81,6 +85,11 @@ class SimpleCache:
 # Global cache instance
 cache = SimpleCache()
 
+# Keys with a stale-while-revalidate refresh in flight, and strong references
+# to those refresh tasks so they are not garbage collected mid-run
+_refreshing_keys: Set[str] = set()
+_refresh_tasks: Set[asyncio.Task] = set()
+
 def cached(ttl: int = 300, key_prefix: str = "default"):
     """
     Decorator for caching function results
@@ -109,51 +118,183 @@ def cached(ttl: int = 300, key_prefix: str = "default"):
         return wrapper
     return decorator
 
-def cache_response(ttl: int = 300, key_prefix: str = "api"):
+def cache_response(
+    ttl: int = 300,
+    key_prefix: str = "api",
+    stale_ttl: int = 0,
+    key_builder: Optional[Callable[..., str]] = None
+):
     """
     Decorator for caching API responses based on request parameters
+
+    Entries are fresh for ``ttl`` seconds. For a further ``stale_ttl`` seconds
+    the cached payload is still returned immediately while a single background
+    task recomputes it (stale-while-revalidate). The refresh runs with its own
+    database session, since the request's session is closed by then.
     
     Args:
         ttl: Time to live in seconds
         key_prefix: Prefix for cache key
+        stale_ttl: Seconds past ttl during which a stale entry is served
+        key_builder: Builds the cache key from the endpoint's keyword arguments;
+            such keys are stored unhashed so invalidate_cache_pattern can match them
     """
     def decorator(func):
+        def store(cache_key: str, result: Any) -> None:
+            now = time.time()
+            cache.set(cache_key, {
+                'payload': result,
+                'generated_at': now,
+                'stale_at': now + ttl,
+                'hard_expire_at': now + ttl + stale_ttl
+            }, ttl + stale_ttl)
+
+        async def refresh(cache_key: str, args: tuple, kwargs: dict) -> None:
+            from app.core.database import async_session_factory
+
+            try:
+                if 'db' in kwargs:
+                    async with async_session_factory() as session:
+                        result = await func(*args, **{**kwargs, 'db': session})
+                else:
+                    result = await func(*args, **kwargs)
+
+                if result is not None:
+                    store(cache_key, result)
+            except Exception as e:
+                logger.warning("Background refresh of cached response %s failed: %s", cache_key, e)
+            finally:
+                _refreshing_keys.discard(cache_key)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Extract request if available
-            request = None
-            for arg in args:
-                if isinstance(arg, Request):
-                    request = arg
-                    break
-            
-            # Generate cache key from function name and parameters
-            cache_key_data = {
-                'function': func.__name__,
-                'args': str(args),
-                'kwargs': {k: str(v) for k, v in kwargs.items() if k != 'db'},  # Exclude db session
-                'query_params': dict(request.query_params) if request else {}
-            }
-            
-            cache_key = cache._generate_key(key_prefix, json.dumps(cache_key_data, sort_keys=True))
+            if key_builder is not None:
+                cache_key = f"{key_prefix}:{key_builder(**kwargs)}"
+            else:
+                # Extract request if available
+                request = None
+                for arg in args:
+                    if isinstance(arg, Request):
+                        request = arg
+                        break
+                
+                # Generate cache key from function name and parameters
+                cache_key_data = {
+                    'function': func.__name__,
+                    'args': str(args),
+                    'kwargs': {k: str(v) for k, v in kwargs.items() if k != 'db'},  # Exclude db session
+                    'query_params': dict(request.query_params) if request else {}
+                }
+                
+                cache_key = cache._generate_key(key_prefix, json.dumps(cache_key_data, sort_keys=True))
             
             # Try to get from cache
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
+            entry = cache.get(cache_key)
+            if entry is not None:
+                if time.time() >= entry['stale_at'] and cache_key not in _refreshing_keys:
+                    _refreshing_keys.add(cache_key)
+                    task = asyncio.create_task(refresh(cache_key, args, kwargs))
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+                return entry['payload']
             
             # Execute function and cache result
             result = await func(*args, **kwargs)
             
             # Only cache successful responses (not exceptions)
             if result is not None:
-                cache.set(cache_key, result, ttl)
+                store(cache_key, result)
             
             return result
         
         return wrapper
     return decorator
 
+def role_cache_key(user_id, organization_id) -> str:
+    """Cache key for a user's role in an organization"""
+    return f"role:{user_id}:{organization_id}"
+
+# The cache is per worker and invalidate_role_cache only reaches the worker
+# handling the change, so other workers may keep authorizing with a changed or
+# removed role for up to this many seconds
+ROLE_CACHE_TTL = 5
+
+def cache_role(ttl: int = ROLE_CACHE_TTL):
+    """
+    Decorator for caching (user_id, organization_id) -> role lookups
+
+    Only found roles are cached, so a user who joins an organization is seen
+    immediately; role changes and removals call invalidate_role_cache, which
+    clears the local worker at once and other workers within ``ttl``.
+
+    Args:
+        ttl: Time to live in seconds
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, user_id, organization_id):
+            cache_key = role_cache_key(user_id, organization_id)
+
+            role = cache.get(cache_key)
+            if role is not None:
+                return role
+
+            role = await func(self, user_id, organization_id)
+            if role is not None:
+                cache.set(cache_key, role, ttl)
+
+            return role
+
+        return wrapper
+    return decorator
+
+def invalidate_role_cache(organization_id, user_id=None) -> int:
+    """
+    Invalidate cached roles for one member, or for every member of an organization
+
+    Returns:
+        Number of entries invalidated
+    """
+    if user_id is not None:
+        cache_key = role_cache_key(user_id, organization_id)
+        removed = 1 if cache_key in cache._cache else 0
+        cache.delete(cache_key)
+        return removed
+
+    suffix = f":{organization_id}"
+    keys_to_delete = [
+        key for key in cache._cache.keys()
+        if key.startswith("role:") and key.endswith(suffix)
+    ]
+
+    for key in keys_to_delete:
+        cache.delete(key)
+
+    return len(keys_to_delete)
+
+# Cached views that list or count an organization's members; keyed
+# "<prefix>:<organization_id>:..."
+MEMBER_CACHE_PREFIXES = ("members", "dashboard", "integrations", "activities")
+
+def invalidate_member_caches(organization_id, user_id=None) -> int:
+    """
+    Invalidate cached roles and member-scoped views after a membership change
+
+    Call after committing any insert, delete or role update of an
+    organization's members.
+
+    Args:
+        organization_id: Organization whose membership changed
+        user_id: Member whose role changed; all members' roles when omitted
+
+    Returns:
+        Number of entries invalidated
+    """
+    removed = invalidate_role_cache(organization_id, user_id)
+    for prefix in MEMBER_CACHE_PREFIXES:
+        removed += invalidate_cache_pattern(f"{prefix}:{organization_id}:")
+    return removed
+
 def invalidate_cache_pattern(pattern: str) -> int:
     """
     Invalidate cache entries matching a pattern
@@ -7,21 +7,49 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import MetaData, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
 
-# Database engine with minimal, safe configuration
+_SYNC_POSTGRES_SCHEMES = ("postgresql+psycopg2://", "postgresql+psycopg://", "postgresql://", "postgres://")
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Point plain or sync-driver PostgreSQL URLs at the asyncpg driver
+
+    create_async_engine rejects non-async drivers such as psycopg2, so a
+    plain or sync-driver URL would fail at startup; asyncpg speaks the
+    binary protocol natively on the event loop.
+    """
+    for scheme in _SYNC_POSTGRES_SCHEMES:
+        if url.startswith(scheme):
+            return "postgresql+asyncpg://" + url[len(scheme):]
+    return url
+
+
+database_url = get_async_database_url(settings.database_url)
+
+# Prepared statements are cached per connection by the asyncpg driver, so
+# repeated queries skip the server-side parse/plan step
+connect_args = {}
+if database_url.startswith("postgresql+asyncpg"):
+    connect_args["prepared_statement_cache_size"] = settings.db_statement_cache_size
+
+# Database engine; AsyncAdaptedQueuePool is the asyncio-safe queue pool
+# (a plain QueuePool blocks the event loop while waiting for a connection)
 engine = create_async_engine(
-    settings.database_url,
+    database_url,
     echo=False,  # Disable SQL logging for performance
+    poolclass=AsyncAdaptedQueuePool,
     pool_pre_ping=True,
-    pool_recycle=3600,  # 1 hour
-    pool_size=5,  # Conservative pool size
-    max_overflow=10,  # Conservative overflow
-    pool_timeout=30,
+    pool_recycle=settings.db_pool_recycle,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_pool_max_overflow,
+    pool_timeout=settings.db_pool_timeout,  # Fail fast instead of queueing requests
     # Minimal connect_args to avoid PostgreSQL parameter issues
-    connect_args={}
+    connect_args=connect_args
 )
 
 # Session factory
@@ -90,6 +118,18 @@ async def init_db():
         raise
 
 
+def get_pool_status() -> dict:
+    """Snapshot of connection pool usage for health checks"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_pool_max_overflow,
+    }
+
+
 async def close_db():
     """
     Close database connections
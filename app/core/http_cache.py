@@ -0,0 +1,32 @@
+"""
+HTTP conditional request helpers (ETag / 304 Not Modified)
+"""
+from fastapi import Request, Response
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from the values that determine a response"""
+    return 'W/"' + ":".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the ETag and ask clients to revalidate before reusing it"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response for a matching ETag"""
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
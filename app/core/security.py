@@ -1,9 +1,15 @@
 """
 Security utilities for authentication and authorization
 """
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 from jose import JWTError, jwt
 import pyotp
 import secrets
@@ -12,8 +18,41 @@ from app.config import settings
 from app.core.exceptions import AuthenticationError, TokenExpiredError
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# bcrypt cost is capped so calibration on a very fast host can't pick a
+# value that makes startup or logins take seconds
+MAX_BCRYPT_ROUNDS = 16
+
+# Password hashing context; hashes below min_rounds are upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds
+)
+
+# One-time invitation passwords use Argon2id; bcrypt hashes on invitations
+# issued before the switch still verify. passlib compares in constant time
+temporary_password_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated=["bcrypt"],
+    argon2__type="ID",
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__rounds=settings.argon2_time_cost,
+    argon2__parallelism=settings.argon2_parallelism
+)
+
+# Hash verified against when a login email is unknown; regenerated whenever
+# the cost changes so both paths keep the same timing
+_dummy_password_hash: Optional[str] = None
+
+# bcrypt is CPU-bound and slow by design; run it on a dedicated pool so it
+# never blocks the event loop
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash"
+)
 
 
 def hash_password(password: str) -> str:
@@ -26,6 +65,85 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was made with weaker parameters than current policy"""
+    return pwd_context.needs_update(hashed_password)
+
+
+def get_dummy_password_hash() -> str:
+    """Get a throwaway hash at the current cost for constant-time logins"""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = hash_password(secrets.token_urlsafe(16))
+    return _dummy_password_hash
+
+
+def calibrate_password_hashing(target_ms: int) -> int:
+    """
+    Pick the highest bcrypt cost whose hash time on this host stays within
+    target_ms, never going below settings.bcrypt_rounds
+    """
+    rounds = settings.bcrypt_rounds
+    sample = secrets.token_urlsafe(16)
+
+    for candidate in range(settings.bcrypt_rounds, MAX_BCRYPT_ROUNDS + 1):
+        start = time.perf_counter()
+        bcrypt.using(rounds=candidate).hash(sample)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > target_ms:
+            break
+        rounds = candidate
+
+    return rounds
+
+
+def configure_password_hashing() -> None:
+    """
+    Apply the password hashing policy at startup: calibrate the bcrypt cost
+    when PASSWORD_HASH_TARGET_MS is set, then prime the dummy hash
+    """
+    global _dummy_password_hash
+
+    if settings.password_hash_target_ms > 0:
+        rounds = calibrate_password_hashing(settings.password_hash_target_ms)
+        settings.bcrypt_rounds = rounds
+        pwd_context.update(bcrypt__rounds=rounds, bcrypt__min_rounds=rounds)
+        logger.info(
+            "Calibrated bcrypt cost to %s rounds (target %s ms)",
+            rounds, settings.password_hash_target_ms
+        )
+
+    _dummy_password_hash = hash_password(secrets.token_urlsafe(16))
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def hash_temporary_password_async(password: str) -> str:
+    """Hash a one-time invitation password (Argon2id) on the password thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, temporary_password_context.hash, password)
+
+
+async def verify_temporary_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a one-time invitation password on the password thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, temporary_password_context.verify, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
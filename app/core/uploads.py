@@ -0,0 +1,73 @@
+"""
+Streaming helpers for storing uploaded files on local disk
+"""
+import os
+import uuid
+from typing import Iterable, Optional
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+from app.config import settings
+from app.core.exceptions import ValidationError
+
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Extensions accepted for avatars and logos, which are served back as images
+IMAGE_FILE_TYPES = ("jpg", "jpeg", "png", "gif")
+
+
+def generate_upload_filename(
+    original_filename: str,
+    allowed_extensions: Optional[Iterable[str]] = None
+) -> str:
+    """
+    Generate a unique, path-safe filename that keeps the original extension
+
+    The extension must be one of ``allowed_extensions`` (default:
+    settings.allowed_file_types), so uploads cannot be stored as HTML/SVG or
+    with path-like suffixes.
+    """
+    if allowed_extensions is None:
+        allowed_extensions = settings.allowed_file_types
+    allowed_extensions = tuple(allowed_extensions)
+
+    file_extension = original_filename.rsplit('.', 1)[-1].lower() if '.' in original_filename else ''
+    if file_extension not in allowed_extensions:
+        raise ValidationError(
+            f"File type '{file_extension}' not allowed. Allowed types: {', '.join(allowed_extensions)}"
+        )
+
+    return f"{uuid.uuid4()}.{file_extension}"
+
+
+async def stream_upload_to_disk(
+    file: UploadFile,
+    file_path: str,
+    max_bytes: int,
+    too_large_message: str = "File is too large"
+) -> int:
+    """
+    Copy an upload to disk in fixed-size chunks and return the bytes written
+
+    The size limit is enforced while streaming, since UploadFile.size is not
+    available for chunked requests. A partially written file is removed
+    before ValidationError is raised.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    written = 0
+    async with aiofiles.open(file_path, "wb") as out:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_bytes:
+                break
+            await out.write(chunk)
+
+    if written > max_bytes:
+        await aiofiles.os.remove(file_path)
+        raise ValidationError(too_large_message)
+
+    return written
@@ -1,11 +1,13 @@
 """
 Main FastAPI application for Agno WorkSphere
 """
+import asyncio
 import os
 import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.responses import JSONResponse
@@ -14,8 +16,10 @@ from app.config import settings
 from app.core.exceptions import APIException
 from app.api.v1.router import api_router
 from app.core.database import init_db
+from app.core.security import configure_password_hashing
 from app.core.logging import setup_logging, get_logger
 from app.core.rate_limiting import rate_limit_middleware
+from app.services.email_service import email_service, start_email_workers, stop_email_workers
 
 # Configure structured logging
 setup_logging()
@@ -27,6 +31,11 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting Agno WorkSphere API...")
+
+    # Calibrate password hashing cost off the event loop
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, configure_password_hashing)
+
     try:
         await init_db()
         logger.info("Database initialized successfully")
@@ -35,10 +44,14 @@ async def lifespan(app: FastAPI):
         logger.error("Server will continue but database operations may fail")
         logger.error("Please run: python setup_postgres.py to setup the database")
 
+    start_email_workers()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Agno WorkSphere API...")
+    await stop_email_workers()
+    await email_service.close()
 
 
 # Create FastAPI app
@@ -71,6 +84,10 @@ if trusted_hosts and trusted_hosts[0]:
 else:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])  # Allow all in dev
 
+# Compress JSON bodies (profiles, organization and member lists); tiny
+# responses are left alone since the gzip framing would outweigh the savings
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Add rate limiting middleware (after CORS)
 app.middleware("http")(rate_limit_middleware)
 
@@ -153,7 +170,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint with database status"""
-    from app.core.database import get_db
+    from app.core.database import get_db, get_pool_status
     from sqlalchemy import text
 
     db_status = "unknown"
@@ -176,7 +193,8 @@ async def health_check():
             "environment": settings.environment,
             "database": {
                 "status": db_status,
-                "error": db_error
+                "error": db_error,
+                "pool": get_pool_status()
             }
         },
         "timestamp": time.time()
@@ -1,7 +1,7 @@
 """
 Notification models
 """
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -27,6 +27,13 @@ class Notification(Base):
     read_at = Column(DateTime(timezone=True), nullable=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Matches the add_notification_indexes migration: the per-user list in
+    # (created_at DESC, id DESC) order, and a partial index over unread rows
+    __table_args__ = (
+        Index('ix_notif_user_created', user_id, created_at.desc(), id.desc()),
+        Index('ix_notif_user_unread', user_id, postgresql_where=text('read = false')),
+    )
+
     # Relationships
     user = relationship("User", back_populates="notifications")
     organization = relationship("Organization")
@@ -1,7 +1,7 @@
 """
 Organization and organization member models
 """
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Boolean, JSON
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Index, Boolean
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,7 +18,7 @@ class Organization(Base):
     description = Column(Text, nullable=True)
     domain = Column(String(255), nullable=True)  # Changed from website to domain to match DB
     logo_url = Column(String(500), nullable=True)
-    allowed_domains = Column(JSON, nullable=True)
+    allowed_domains = Column(ARRAY(Text), nullable=True)
 
     # Contact information
     contact_email = Column(String(255), nullable=True)
@@ -66,6 +66,9 @@ class OrganizationMember(Base):
     __table_args__ = (
         CheckConstraint("role IN ('viewer', 'member', 'admin', 'owner')", name='valid_role'),
         UniqueConstraint('organization_id', 'user_id', name='unique_org_user'),
+        # Covering index for role lookups by (user, organization); matches
+        # the add_org_member_lookup_indexes migration
+        Index('ix_org_member_user_org', 'user_id', 'organization_id', postgresql_include=['role']),
     )
 
     # Relationships
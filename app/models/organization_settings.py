@@ -3,7 +3,7 @@ Organization Settings Model
 Enhanced organization settings for multi-organization management
 """
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON, Text, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON, Text, Integer, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -98,6 +98,16 @@ class InvitationToken(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # Matches the add_invitation_pending_index migration: pending (unused)
+    # invitations per organization
+    __table_args__ = (
+        Index(
+            'ix_invitation_tokens_org_pending',
+            organization_id, expires_at,
+            postgresql_where=text('is_used = false')
+        ),
+    )
+
     # Relationships
     organization = relationship("Organization")
     project = relationship("Project")
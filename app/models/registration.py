@@ -56,7 +56,7 @@ class Registration(Base):
     
     # Linked Records
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)  # Created user after approval
-    organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id'), nullable=True)  # Created/joined org
+    organization_id = Column(UUID(as_uuid=True), ForeignKey('organizations.id', ondelete='SET NULL'), nullable=True)  # Created/joined org
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -66,9 +66,10 @@ class Registration(Base):
     form_metadata = Column(JSON, nullable=True)  # Store any additional form data
     
     # Relationships
-    user = relationship("User", foreign_keys=[user_id], back_populates="registration")
-    organization = relationship("Organization", foreign_keys=[organization_id])
-    processor = relationship("User", foreign_keys=[processed_by])
+    # Never loaded implicitly; callers join or eager-load what they need
+    user = relationship("User", foreign_keys=[user_id], back_populates="registration", lazy="raise_on_sql")
+    organization = relationship("Organization", foreign_keys=[organization_id], lazy="raise_on_sql")
+    processor = relationship("User", foreign_keys=[processed_by], lazy="raise_on_sql")
 
     def __repr__(self):
         return f"<Registration(id={self.id}, email={self.email}, organization={self.organization_name}, status={self.status})>"
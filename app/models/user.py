@@ -1,7 +1,7 @@
 """
 User model
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Text, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -23,12 +23,19 @@ class User(Base):
     two_factor_enabled = Column(Boolean, default=False, nullable=False)
     two_factor_secret = Column(String(255), nullable=True)
     last_login_at = Column(DateTime(timezone=True), nullable=True)
+    notification_preferences = Column(JSON, nullable=True)  # Overrides of the NotificationPreferences defaults
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Serves case-insensitive lookups (func.lower(User.email) == ...); matches
+    # the add_users_email_lower_index migration
+    __table_args__ = (
+        Index('ix_users_email_lower', func.lower(email)),
+    )
+
     # Relationships
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
-    registration = relationship("Registration", foreign_keys="Registration.user_id", back_populates="user", uselist=False)
+    registration = relationship("Registration", foreign_keys="Registration.user_id", back_populates="user", uselist=False, lazy="raise_on_sql")
     sessions = relationship("UserSession", back_populates="user", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -1,8 +1,8 @@
 """
 Authentication schemas
 """
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, StringConstraints, field_validator
+from typing import Optional, List, Annotated
 from datetime import datetime
 from uuid import UUID
 
@@ -10,30 +10,34 @@ from app.config import settings
 from app.core.security import validate_password_strength
 
 
+PASSWORD_REQUIREMENTS_MESSAGE = (
+    f'Password must be at least {settings.password_min_length} characters long '
+    'and contain uppercase, lowercase, digit, and special character'
+)
+
+# First/last name, stripped and at least 2 characters long
+PersonName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=2)]
+
+
+def _check_password_strength(v: str) -> str:
+    """Reject passwords that do not meet the configured strength rules"""
+    if not validate_password_strength(v):
+        raise ValueError(PASSWORD_REQUIREMENTS_MESSAGE)
+    return v
+
+
 class UserRegister(BaseModel):
     email: EmailStr
     password: str
-    first_name: str
-    last_name: str
+    first_name: PersonName
+    last_name: PersonName
     organization_name: Optional[str] = None
     organization_domain: Optional[str] = None
     
-    @validator('password')
-    def validate_password(cls, v):
-        if not validate_password_strength(v):
-            raise ValueError(
-                f'Password must be at least {settings.password_min_length} characters long '
-                'and contain uppercase, lowercase, digit, and special character'
-            )
-        return v
-    
-    @validator('first_name', 'last_name')
-    def validate_names(cls, v):
-        if not v.strip():
-            raise ValueError('Name cannot be empty')
-        if len(v.strip()) < 2:
-            raise ValueError('Name must be at least 2 characters long')
-        return v.strip()
+    @field_validator('password', mode='after')
+    @classmethod
+    def validate_password(cls, v: str) -> str:
+        return _check_password_strength(v)
 
 
 class UserLogin(BaseModel):
@@ -59,8 +63,7 @@ class UserResponse(BaseModel):
     last_login_at: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrganizationInfo(BaseModel):
@@ -68,8 +71,7 @@ class OrganizationInfo(BaseModel):
     name: str
     role: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuthResponse(BaseModel):
@@ -90,14 +92,10 @@ class ResetPasswordRequest(BaseModel):
     token: str
     new_password: str
     
-    @validator('new_password')
-    def validate_password(cls, v):
-        if not validate_password_strength(v):
-            raise ValueError(
-                f'Password must be at least {settings.password_min_length} characters long '
-                'and contain uppercase, lowercase, digit, and special character'
-            )
-        return v
+    @field_validator('new_password', mode='after')
+    @classmethod
+    def validate_password(cls, v: str) -> str:
+        return _check_password_strength(v)
 
 
 class VerifyEmailRequest(BaseModel):
@@ -117,11 +115,7 @@ class ChangePasswordRequest(BaseModel):
     current_password: str
     new_password: str
     
-    @validator('new_password')
-    def validate_password(cls, v):
-        if not validate_password_strength(v):
-            raise ValueError(
-                f'Password must be at least {settings.password_min_length} characters long '
-                'and contain uppercase, lowercase, digit, and special character'
-            )
-        return v
+    @field_validator('new_password', mode='after')
+    @classmethod
+    def validate_password(cls, v: str) -> str:
+        return _check_password_strength(v)
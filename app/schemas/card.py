@@ -1,86 +1,62 @@
 """
 Card schemas
 """
-from pydantic import BaseModel, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, NonNegativeInt, field_validator
+from sqlalchemy import inspect as sa_inspect
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from uuid import UUID
 
 
+CardPriority = Literal['low', 'medium', 'high', 'urgent']
+
+
+def _require_text(v: str, message: str) -> str:
+    """Strip surrounding whitespace and reject strings that are left empty"""
+    v = v.strip()
+    if not v:
+        raise ValueError(message)
+    return v
+
+
 class CardCreate(BaseModel):
     title: str
     description: Optional[str] = ""
     column_id: str  # Required column ID
-    position: Optional[int] = None  # Will be auto-calculated if not provided
-    priority: str = "medium"
+    position: Optional[NonNegativeInt] = None  # Will be auto-calculated if not provided
+    priority: CardPriority = "medium"
     due_date: Optional[datetime] = None
     assigned_to: Optional[List[str]] = None  # List of user IDs
     checklist: Optional[List[Dict[str, Any]]] = None  # AI-generated checklist items
     labels: Optional[list] = None  # List of label strings or objects
     
-    @validator('title')
-    def validate_title(cls, v):
-        if not v.strip():
-            raise ValueError('Card title cannot be empty')
-        return v.strip()
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        if v not in ['low', 'medium', 'high', 'urgent']:
-            raise ValueError('Priority must be low, medium, high, or urgent')
-        return v
-    
-    @validator('position')
-    def validate_position(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Position must be non-negative')
-        return v
+    @field_validator('title', mode='after')
+    @classmethod
+    def validate_title(cls, v: str) -> str:
+        return _require_text(v, 'Card title cannot be empty')
 
 
 class CardUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    position: Optional[int] = None
-    priority: Optional[str] = None
+    position: Optional[NonNegativeInt] = None
+    priority: Optional[CardPriority] = None
     due_date: Optional[datetime] = None
     assigned_to: Optional[List[str]] = None
     checklist: Optional[List[Dict[str, Any]]] = None
     labels: Optional[list] = None  # List of label strings or objects
     
-    @validator('title')
-    def validate_title(cls, v):
-        if v is not None and not v.strip():
-            raise ValueError('Card title cannot be empty')
-        return v.strip() if v else v
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        if v is not None and v not in ['low', 'medium', 'high', 'urgent']:
-            raise ValueError('Priority must be low, medium, high, or urgent')
-        return v
-    
-    @validator('position')
-    def validate_position(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Position must be non-negative')
-        return v
+    @field_validator('title', mode='after')
+    @classmethod
+    def validate_title(cls, v: Optional[str]) -> Optional[str]:
+        return v if v is None else _require_text(v, 'Card title cannot be empty')
 
 
 class CardMove(BaseModel):
     target_column_id: UUID
-    position: Optional[int] = None
-
-    @validator('position')
-    def validate_position(cls, v):
-        """Validate that the provided position is non-negative if set.
-
-        The position field is optional when moving a card.  If provided, it must
-        be a non‑negative integer.  When omitted, the API will append the card
-        to the end of the target column.
-        """
-        if v is not None and v < 0:
-            raise ValueError('Position must be non-negative')
-        return v
+    # Optional when moving a card; when omitted, the API appends the card to
+    # the end of the target column
+    position: Optional[NonNegativeInt] = None
 
 
 class CardAssignmentResponse(BaseModel):
@@ -90,8 +66,53 @@ class CardAssignmentResponse(BaseModel):
     assigned_at: datetime
     user: dict  # Will contain user details
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_assignment(cls, assignment):
+        """Build from a CardAssignment whose user relationship is loaded"""
+        user = assignment.user
+        return cls(
+            id=assignment.id,
+            user_id=assignment.user_id,
+            assigned_by=assignment.assigned_by,
+            assigned_at=assignment.assigned_at,
+            user={
+                "id": str(user.id),
+                "email": user.email,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "avatar_url": user.avatar_url
+            }
+        )
+
+
+class CardChecklistItemResponse(BaseModel):
+    """Checklist item embedded in a card; UUID and datetime fields are encoded by the JSON response"""
+    id: UUID
+    text: str
+    completed: bool
+    position: int
+    ai_generated: bool
+    confidence: Optional[int] = None
+    metadata: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_item(cls, item):
+        """Build from a loaded ChecklistItem without re-validating it"""
+        return cls.model_construct(
+            id=item.id,
+            text=item.text,
+            completed=item.completed,
+            position=item.position,
+            ai_generated=item.ai_generated,
+            confidence=item.confidence,
+            metadata=item.ai_metadata,
+            created_at=item.created_at,
+            updated_at=item.updated_at
+        )
 
 
 class CardResponse(BaseModel):
@@ -108,14 +129,15 @@ class CardResponse(BaseModel):
     updated_at: datetime
     labels: Optional[list] = None
     assignments: Optional[List[CardAssignmentResponse]] = []
-    checklist_items: Optional[List[Dict[str, Any]]] = []
+    checklist_items: Optional[List[CardChecklistItemResponse]] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
     @classmethod
     def from_orm(cls, obj):
-        # Handle the relationships manually to avoid async issues
+        # Handle the relationships manually: only eager-loaded collections are
+        # read, since a lazy load cannot run here under asyncio
+        unloaded = sa_inspect(obj).unloaded
         data = {
             'id': obj.id,
             'column_id': obj.column_id,
@@ -133,32 +155,16 @@ class CardResponse(BaseModel):
             'checklist_items': []
         }
 
-        # Handle assignments if loaded
-        if hasattr(obj, 'assignments') and obj.assignments:
-            try:
-                data['assignments'] = [CardAssignmentResponse.from_orm(assignment) for assignment in obj.assignments]
-            except:
-                data['assignments'] = []
-
-        # Handle checklist items if loaded
-        if hasattr(obj, 'checklist_items') and obj.checklist_items:
-            try:
-                data['checklist_items'] = [
-                    {
-                        "id": str(item.id),
-                        "text": item.text,
-                        "completed": item.completed,
-                        "position": item.position,
-                        "ai_generated": item.ai_generated,
-                        "confidence": item.confidence,
-                        "metadata": item.ai_metadata,
-                        "created_at": item.created_at.isoformat() if item.created_at else None,
-                        "updated_at": item.updated_at.isoformat() if item.updated_at else None
-                    }
-                    for item in obj.checklist_items
-                ]
-            except:
-                data['checklist_items'] = []
+        if 'assignments' not in unloaded:
+            data['assignments'] = [
+                CardAssignmentResponse.from_assignment(assignment) for assignment in obj.assignments
+            ]
+
+        if 'checklist_items' not in unloaded:
+            data['checklist_items'] = [
+                CardChecklistItemResponse.from_item(item)
+                for item in sorted(obj.checklist_items, key=lambda item: item.position)
+            ]
 
         return cls(**data)
 
@@ -166,21 +172,19 @@ class CardResponse(BaseModel):
 class CommentCreate(BaseModel):
     content: str
     
-    @validator('content')
-    def validate_content(cls, v):
-        if not v.strip():
-            raise ValueError('Comment content cannot be empty')
-        return v.strip()
+    @field_validator('content', mode='after')
+    @classmethod
+    def validate_content(cls, v: str) -> str:
+        return _require_text(v, 'Comment content cannot be empty')
 
 
 class CommentUpdate(BaseModel):
     content: str
     
-    @validator('content')
-    def validate_content(cls, v):
-        if not v.strip():
-            raise ValueError('Comment content cannot be empty')
-        return v.strip()
+    @field_validator('content', mode='after')
+    @classmethod
+    def validate_content(cls, v: str) -> str:
+        return _require_text(v, 'Comment content cannot be empty')
 
 
 class CommentResponse(BaseModel):
@@ -192,8 +196,7 @@ class CommentResponse(BaseModel):
     updated_at: datetime
     user: dict  # Will contain user details
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AttachmentResponse(BaseModel):
@@ -208,8 +211,7 @@ class AttachmentResponse(BaseModel):
     uploaded_at: datetime
     uploader: dict  # Will contain user details
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ActivityResponse(BaseModel):
@@ -222,5 +224,4 @@ class ActivityResponse(BaseModel):
     created_at: datetime
     user: dict  # Will contain user details
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -76,12 +76,16 @@ class NotificationStats(BaseModel):
     read_notifications: int
 
 
+# Upper bound on recipients of one bulk notification request
+MAX_BULK_NOTIFICATION_RECIPIENTS = 500
+
+
 class BulkNotificationCreate(BaseModel):
-    user_ids: list[UUID]
+    user_ids: list[UUID] = Field(..., min_length=1, max_length=MAX_BULK_NOTIFICATION_RECIPIENTS)
     title: str = Field(..., min_length=1, max_length=255)
     message: str = Field(..., min_length=1)
     type: str = Field(..., min_length=1, max_length=50)
     priority: str = Field(default="normal", pattern="^(low|normal|high|urgent)$")
-    organization_id: Optional[UUID] = None
+    organization_id: UUID
     action_url: Optional[str] = Field(None, max_length=500)
     notification_metadata: Optional[Dict[str, Any]] = None
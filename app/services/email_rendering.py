@@ -0,0 +1,227 @@
+"""
+Email body rendering
+
+Bodies are Jinja templates from email_templates/, compiled once at import.
+This module has no I/O or service dependencies, so it can be compiled
+ahead of time (e.g. ``mypyc app/services/email_rendering.py``). A compiled
+extension shadows this file when present.
+"""
+import os
+import re
+from functools import lru_cache
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import escape
+
+
+DEFAULT_LOGIN_URL = "http://localhost:3000/login"
+
+# Role badge colours in the enhanced invitation
+ROLE_COLORS = MappingProxyType({
+    'owner': '#ff6b6b',
+    'admin': '#4ecdc4',
+    'member': '#45b7d1'
+})
+DEFAULT_ROLE_COLOR = '#45b7d1'
+
+_STYLE_BLOCK = re.compile(r"(<style>)(.*?)(</style>)", re.S)
+_JINJA_TAG = re.compile(r"(\{\{.*?\}\}|\{%.*?%\})", re.S)
+
+
+def _collapse_css(css: str) -> str:
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([;:,])\s*", r"\1", css)
+    css = re.sub(r"\{\s*", "{", css)
+    return re.sub(r"\s*\}\s*", "}\n", css)
+
+
+def _minify_css(css: str) -> str:
+    """Collapse whitespace in CSS, keeping one rule per line and Jinja tags intact"""
+    parts = _JINJA_TAG.split(css)
+    parts[::2] = [_collapse_css(part) for part in parts[::2]]
+    return "".join(parts).strip()
+
+
+class _MinifiedStyleLoader(FileSystemLoader):
+    """Template loader that minifies stylesheets and <style> blocks as sources are read"""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if template.endswith(".css"):
+            source = _minify_css(source)
+        else:
+            source = _STYLE_BLOCK.sub(lambda m: m[1] + _minify_css(m[2]) + m[3], source)
+        return source, filename, uptodate
+
+
+# Email bodies are Jinja templates, parsed and compiled once at import; HTML
+# templates autoescape their inputs, plain-text ones do not. Styles shared by
+# several templates live in common.css
+_template_env = Environment(
+    loader=_MinifiedStyleLoader(os.path.join(os.path.dirname(__file__), "email_templates")),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+    cache_size=-1
+)
+_INVITATION_HTML = _template_env.get_template("invitation.html")
+_PROJECT_CREATED_HTML = _template_env.get_template("project_created.html")
+_PROJECT_CREATED_TEXT = _template_env.get_template("project_created.txt")
+_ENHANCED_INVITATION_HTML = _template_env.get_template("enhanced_invitation.html")
+_ENHANCED_INVITATION_TEXT = _template_env.get_template("enhanced_invitation.txt")
+
+_PLACEHOLDER_PATTERN = re.compile("\x00(\\w+)\x00")
+
+
+def _placeholders(*fields: str) -> Dict[str, str]:
+    """Placeholder markers to render in place of values filled in per send"""
+    return {field: f"\x00{field}\x00" for field in fields}
+
+
+class PresplitBody(NamedTuple):
+    """A rendered body split around its placeholders, static parts UTF-8 encoded"""
+    segments: Tuple[bytes, ...]
+    fields: Tuple[str, ...]
+    join: Callable[..., bytes]
+
+
+def _make_join(segments: Tuple[bytes, ...], fields: Tuple[str, ...]) -> Callable[..., bytes]:
+    """
+    Bind a join over one body's segments
+
+    The returned function takes the encoded values as keyword arguments and
+    returns a single b"".join over the segments and values in order; a
+    missing value raises KeyError.
+    """
+    pairs = tuple(zip(segments, fields))
+    last = segments[-1]
+
+    def join(**values: bytes) -> bytes:
+        parts = []
+        for segment, field in pairs:
+            parts += (segment, values[field])
+        parts.append(last)
+        return b"".join(parts)
+
+    return join
+
+
+def _presplit(body: str) -> PresplitBody:
+    """Split a body rendered with placeholders and encode its static parts once"""
+    parts = _PLACEHOLDER_PATTERN.split(body)
+    segments = tuple(part.encode() for part in parts[::2])
+    fields = tuple(parts[1::2])
+    return PresplitBody(segments, fields, _make_join(segments, fields))
+
+
+def fill_placeholders(body: PresplitBody, escape_html: bool, **values: str) -> bytes:
+    """Join a presplit body with the encoded values for its placeholders"""
+    return body.join(**{
+        field: (str(escape(value)) if escape_html else value).encode()
+        for field, value in values.items()
+    })
+
+
+# The welcome email has no shared inputs, so it is rendered and encoded once
+_WELCOME_PLACEHOLDERS = _placeholders("user_email", "user_name", "organization_name", "login_url")
+_WELCOME_HTML = _presplit(_template_env.get_template("welcome.html").render(**_WELCOME_PLACEHOLDERS))
+_WELCOME_TEXT = _presplit(_template_env.get_template("welcome.txt").render(**_WELCOME_PLACEHOLDERS))
+
+# Per-recipient values are rendered as placeholders so invitation bodies can
+# be memoized on the shared inputs alone; they are filled in afterwards and
+# must never be part of a cache key
+_RECIPIENT_PLACEHOLDERS = _placeholders("to_email", "invitation_url", "temp_password")
+
+
+@lru_cache(maxsize=512)
+def render_invitation_body(inviter_name: str, organization_name: str, role: str) -> PresplitBody:
+    """Invitation HTML for the shared inputs, with recipient placeholders"""
+    return _presplit(_INVITATION_HTML.render(
+        inviter_name=inviter_name,
+        organization_name=organization_name,
+        role=role,
+        to_email=_RECIPIENT_PLACEHOLDERS["to_email"],
+        invitation_url=_RECIPIENT_PLACEHOLDERS["invitation_url"]
+    ))
+
+
+@lru_cache(maxsize=512)
+def render_enhanced_invitation_body(
+    inviter_name: str,
+    organization_name: str,
+    role: str,
+    project_name: Optional[str],
+    custom_message: Optional[str]
+) -> Tuple[PresplitBody, PresplitBody]:
+    """Enhanced invitation (HTML, text) for the shared inputs, with recipient placeholders"""
+    context = dict(
+        inviter_name=inviter_name,
+        organization_name=organization_name,
+        role=role,
+        role_color=ROLE_COLORS.get(role.lower(), DEFAULT_ROLE_COLOR),
+        project_name=project_name,
+        custom_message=custom_message,
+        **_RECIPIENT_PLACEHOLDERS
+    )
+    return (
+        _presplit(_ENHANCED_INVITATION_HTML.render(**context)),
+        _presplit(_ENHANCED_INVITATION_TEXT.render(**context))
+    )
+
+
+def render_welcome(
+    user_email: str,
+    user_name: str,
+    organization_name: str,
+    login_url: str
+) -> Tuple[bytes, bytes]:
+    """Welcome email (HTML, text)"""
+    values = dict(
+        user_email=user_email,
+        user_name=user_name,
+        organization_name=organization_name,
+        login_url=login_url
+    )
+    return (
+        fill_placeholders(_WELCOME_HTML, escape_html=True, **values),
+        fill_placeholders(_WELCOME_TEXT, escape_html=False, **values)
+    )
+
+
+def render_project_created(
+    owner_email: str,
+    owner_name: str,
+    project_data: dict,
+    organization_name: str
+) -> Tuple[str, str]:
+    """Project creation confirmation (HTML, text)"""
+    # Extract project details
+    project_name = project_data.get('name', 'Untitled Project')
+    project_description = project_data.get('description', 'No description provided')
+    team_size = project_data.get('teamSize', 'Not specified')
+    industry = project_data.get('industry', 'Not specified')
+    tasks_created = len(project_data.get('tasks', []))
+    estimated_duration = project_data.get('estimatedDuration', 'Not specified')
+    tech_stack = project_data.get('techStack', {})
+    workflow_phases = tuple(islice(project_data.get('workflow', {}).get('phases', ()), 5))
+
+    context = dict(
+        owner_name=owner_name,
+        owner_email=owner_email,
+        organization_name=organization_name,
+        project_name=project_name,
+        project_description=project_description,
+        team_size=team_size,
+        industry=industry,
+        tasks_created=tasks_created,
+        estimated_duration=estimated_duration,
+        tech_stack=tech_stack,
+        tech_items=tuple(islice(
+            chain(tech_stack.get('frontend', ()), tech_stack.get('backend', ()), tech_stack.get('database', ())),
+            8
+        )) if tech_stack else (),
+        workflow_phases=workflow_phases
+    )
+    return _PROJECT_CREATED_HTML.render(**context), _PROJECT_CREATED_TEXT.render(**context)
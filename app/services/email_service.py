@@ -1,18 +1,133 @@
 """
 Email service for sending notifications
 """
-import smtplib
+import asyncio
+import hashlib
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional, List
+from collections import deque
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import AsyncIterator, Awaitable, Callable, Deque, Iterable, NamedTuple, Optional, List, Tuple, Union
 import logging
 
+import aiosmtplib
+
 from app.config import settings
+from app.core.cache import cache
+from app.services.email_rendering import (
+    DEFAULT_LOGIN_URL,
+    fill_placeholders,
+    render_enhanced_invitation_body,
+    render_invitation_body,
+    render_project_created,
+    render_welcome
+)
 
 logger = logging.getLogger(__name__)
 
 
+async def _quit_quietly(server: aiosmtplib.SMTP) -> None:
+    """QUIT an SMTP session, dropping the socket if the server is already gone"""
+    try:
+        await server.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        server.close()
+
+
+class OutgoingEmail(NamedTuple):
+    """One message for EmailService.send_many"""
+    to_email: str
+    subject: str
+    html_content: Union[str, bytes]
+    text_content: Union[str, bytes, None] = None
+
+
+class SMTPConnection:
+    """An authenticated SMTP session and the number of messages sent on it"""
+
+    def __init__(self, server: aiosmtplib.SMTP):
+        self.server = server
+        self.messages_sent = 0
+
+
+class SMTPPool:
+    """
+    Bounded pool of authenticated SMTP sessions
+
+    At most ``max_size`` sessions are open, so that many sends run in
+    parallel. A session is retired once ``max_messages_per_connection``
+    messages have been sent on it (senders count them in ``messages_sent``)
+    to stay under provider per-connection limits.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[aiosmtplib.SMTP]],
+        max_size: int = 5,
+        max_messages_per_connection: int = 100
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self._idle: Deque[SMTPConnection] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    async def _is_alive(conn: SMTPConnection) -> bool:
+        if not conn.server.is_connected:
+            return False
+        try:
+            response = await conn.server.noop()
+            return response.code == 250
+        except (aiosmtplib.SMTPException, OSError):
+            return False
+
+    async def _checkout(self) -> SMTPConnection:
+        """Take the most recently used live idle session, or open a new one"""
+        while self._idle:
+            conn = self._idle.pop()
+            if await self._is_alive(conn):
+                return conn
+            await _quit_quietly(conn.server)
+
+        return SMTPConnection(await self._connect())
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[SMTPConnection]:
+        """Borrow a session for one send; it is returned or retired afterwards"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+
+        async with self._slots:
+            conn = await self._checkout()
+            # None until the send finishes; left None on cancellation, when the
+            # session may be mid-transaction and is dropped without a QUIT
+            reusable: Optional[bool] = None
+            try:
+                yield conn
+                reusable = conn.messages_sent < self.max_messages_per_connection
+            except (aiosmtplib.SMTPServerDisconnected, OSError):
+                # The session is unusable; let the next send open a new one
+                reusable = False
+                raise
+            except Exception:
+                # e.g. a refused recipient: aiosmtplib has RSET the session
+                reusable = True
+                raise
+            finally:
+                if reusable:
+                    self._idle.append(conn)
+                elif reusable is None:
+                    conn.server.close()
+                else:
+                    await _quit_quietly(conn.server)
+
+    async def close(self) -> None:
+        """QUIT every idle session"""
+        while self._idle:
+            await _quit_quietly(self._idle.pop().server)
+
+
 class EmailService:
     """Email service for sending notifications"""
     
@@ -22,64 +137,202 @@ class EmailService:
         self.smtp_user = settings.smtp_user
         self.smtp_pass = settings.smtp_pass
         self.from_email = settings.from_email
-        self.from_name = getattr(settings, 'from_name', 'Agno WorkSphere')
+        self.from_name = settings.from_name
+        self._from_header = f"{self.from_name} <{self.from_email}>"
+        self._smtp_enabled = bool(self.smtp_user and self.smtp_pass)
+        self.dedupe_ttl = settings.email_dedupe_ttl
+
+        # Loading the CA bundle is costly; one context serves every session
+        self._ssl_context = ssl.create_default_context()
+
+        # Authenticated SMTP sessions reused across sends
+        self._smtp_pool = SMTPPool(
+            self._connect_smtp,
+            max_size=settings.smtp_pool_size,
+            max_messages_per_connection=settings.smtp_max_messages_per_connection
+        )
+
+    async def _connect_smtp(self) -> aiosmtplib.SMTP:
+        """Open a new SMTP session (TCP connect, STARTTLS and LOGIN)"""
+        server = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            start_tls=True,
+            tls_context=self._ssl_context,
+            username=self.smtp_user,
+            password=self.smtp_pass
+        )
+        await server.connect()
+        return server
+
+    async def close(self) -> None:
+        """Close the pooled SMTP sessions"""
+        await self._smtp_pool.close()
+
+    @staticmethod
+    def _attach_body(attach: Callable, content: Union[str, bytes], subtype: str) -> None:
+        """
+        Attach a UTF-8 text body as-is (8bit)
+
+        This skips the quoted-printable/base64 pass the email package runs
+        over non-ASCII str bodies; aiosmtplib falls back to base64 for servers
+        without 8BITMIME. Bodies with lines over the SMTP limit use base64.
+        """
+        if isinstance(content, str):
+            content = content.encode()
+        too_long = any(len(line) > 998 for line in content.splitlines())
+        attach(
+            content, "text", subtype,
+            cte="base64" if too_long else "8bit",
+            params={"charset": "utf-8"}
+        )
+
+    def _build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: Union[str, bytes],
+        text_content: Union[str, bytes, None] = None
+    ) -> EmailMessage:
+        """Build the message: plain text with an HTML alternative, or HTML only"""
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self._from_header
+        message["To"] = to_email
+
+        if text_content:
+            self._attach_body(message.set_content, text_content, "plain")
+            self._attach_body(message.add_alternative, html_content, "html")
+        else:
+            self._attach_body(message.set_content, html_content, "html")
+
+        return message
+
+    async def _send(self, conn: SMTPConnection, message: EmailMessage, to_email: str) -> None:
+        """Send one message on a pooled session"""
+        await conn.server.send_message(message, sender=self.from_email, recipients=to_email)
+        conn.messages_sent += 1
+
+    async def _send_batch(self, conn: SMTPConnection, batch: List[Tuple[str, EmailMessage]]) -> List[bool]:
+        """
+        Send several messages back to back on one session
+
+        A refused message fails only itself; aiosmtplib RSETs the session
+        before the next one. A dropped session aborts the batch.
+        """
+        results = []
+        for to_email, message in batch:
+            try:
+                await self._send(conn, message, to_email)
+                results.append(True)
+            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused, aiosmtplib.SMTPDataError) as e:
+                logger.error(f"Failed to send email to {to_email}: {e}")
+                results.append(False)
+        return results
+
+    async def _send_group(self, batch: List[Tuple[str, EmailMessage]]) -> List[bool]:
+        """Send a batch on one pooled session; every message fails if the session does"""
+        try:
+            async with self._smtp_pool.acquire() as conn:
+                return await self._send_batch(conn, batch)
+        except Exception as e:
+            logger.error(f"Failed to send batch of {len(batch)} emails: {e}")
+            return [False] * len(batch)
+
+    @staticmethod
+    def _dedupe_key(to_email: str, subject: str, html_content: Union[str, bytes]) -> str:
+        """Cache key identifying an email by recipient, subject and HTML body"""
+        if isinstance(html_content, str):
+            html_content = html_content.encode()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(to_email.encode())
+        digest.update(b"\x00")
+        digest.update(subject.encode())
+        digest.update(b"\x00")
+        digest.update(html_content)
+        return f"email_sent:{digest.hexdigest()}"
+
+    def _claim(self, key: str) -> bool:
+        """
+        Mark an email as being sent; False if an identical one was sent within
+        ``dedupe_ttl`` seconds (retries, double-clicked resends). A failed send
+        releases its claim with ``cache.delete``.
+        """
+        if not self.dedupe_ttl:
+            return True
+        if cache.get(key) is not None:
+            return False
+        cache.set(key, True, ttl=self.dedupe_ttl)
+        return True
+
+    async def send_many(self, emails: Iterable[OutgoingEmail]) -> List[bool]:
+        """
+        Send several emails concurrently and return per-message success flags
+
+        Messages are split into one batch per pooled session (capped at the
+        per-connection message limit); each batch reuses a single session.
+        Duplicates of recently sent emails are skipped and reported as sent.
+        """
+        emails = list(emails)
+        if not emails:
+            return []
+
+        if not self._smtp_enabled:
+            return [await self.send_email(*email) for email in emails]
+
+        results: List[bool] = [True] * len(emails)
+        pending = []
+        for index, email in enumerate(emails):
+            key = self._dedupe_key(email.to_email, email.subject, email.html_content)
+            if self._claim(key):
+                pending.append((index, key, email))
+        if len(pending) < len(emails):
+            logger.info(f"Skipping {len(emails) - len(pending)} duplicate emails")
+        if not pending:
+            return results
+
+        built = [(email.to_email, self._build_message(*email)) for _, _, email in pending]
+
+        pool = self._smtp_pool
+        batch_size = min(-(-len(built) // pool.max_size), pool.max_messages_per_connection)
+        batches = [built[i:i + batch_size] for i in range(0, len(built), batch_size)]
+
+        batch_results = await asyncio.gather(*(self._send_group(batch) for batch in batches))
+        sent_flags = [sent for group in batch_results for sent in group]
+        for (index, key, _), sent in zip(pending, sent_flags):
+            results[index] = sent
+            if not sent:
+                cache.delete(key)
+        return results
     
     async def send_email(
         self,
         to_email: str,
         subject: str,
-        html_content: str,
-        text_content: Optional[str] = None
+        html_content: Union[str, bytes],
+        text_content: Union[str, bytes, None] = None
     ) -> bool:
         """Send an email"""
+        if not self._smtp_enabled:
+            logger.warning("Email not sent (no SMTP configuration): to=%s subject=%s", to_email, subject)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Email content: %s...", text_content or html_content[:200])
+            return False  # Return False to indicate email wasn't actually sent
+
+        key = self._dedupe_key(to_email, subject, html_content)
+        if not self._claim(key):
+            logger.info("Skipping duplicate email: to=%s subject=%s", to_email, subject)
+            return True
+
         try:
-            # Check if SMTP credentials are available
-            if not self.smtp_user or not self.smtp_pass:
-                logger.info(f"📧 EMAIL (No SMTP Config - Logging Only)")
-                logger.info(f"To: {to_email}")
-                logger.info(f"Subject: {subject}")
-                logger.info(f"Content: {text_content or html_content[:200]}...")
-                print(f"\n📧 EMAIL NOT SENT (No SMTP Configuration)")
-                print(f"To: {to_email}")
-                print(f"Subject: {subject}")
-                print(f"Content: {text_content or html_content[:200]}...")
-                print("-" * 50)
-                return False  # Return False to indicate email wasn't actually sent
-
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = f"{self.from_name} <{self.from_email}>"
-            message["To"] = to_email
-
-            # Add text content
-            if text_content:
-                text_part = MIMEText(text_content, "plain")
-                message.attach(text_part)
-
-            # Add HTML content
-            html_part = MIMEText(html_content, "html")
-            message.attach(html_part)
-            
-            # Send email
-            if self.smtp_user and self.smtp_pass:
-                context = ssl.create_default_context()
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.starttls(context=context)
-                    server.login(self.smtp_user, self.smtp_pass)
-                    server.sendmail(self.from_email, to_email, message.as_string())
-                
-                logger.info(f"Email sent successfully to {to_email}")
-                print(f"\n✅ EMAIL SENT SUCCESSFULLY")
-                print(f"To: {to_email}")
-                print(f"Subject: {subject}")
-                print("-" * 50)
-                return True
-            else:
-                logger.warning("SMTP credentials not configured, email not sent")
-                return False
-                
+            message = self._build_message(to_email, subject, html_content, text_content)
+            async with self._smtp_pool.acquire() as conn:
+                await self._send(conn, message, to_email)
+
+            logger.info("Email sent successfully: to=%s subject=%s", to_email, subject)
+            return True
         except Exception as e:
+            cache.delete(key)
             logger.error(f"Failed to send email to {to_email}: {e}")
             return False
     
@@ -88,116 +341,12 @@ class EmailService:
         user_email: str,
         user_name: str,
         organization_name: str,
-        login_url: str = "http://localhost:3000/login"
+        login_url: str = DEFAULT_LOGIN_URL
     ) -> bool:
         """Send welcome email to new user"""
         subject = f"Welcome to {organization_name} - Your Agno WorkSphere Account is Ready!"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Welcome to Agno WorkSphere</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-                .features {{ background: white; padding: 20px; border-radius: 5px; margin: 20px 0; }}
-                .feature {{ margin: 10px 0; padding: 10px; border-left: 4px solid #667eea; }}
-                .footer {{ text-align: center; color: #666; font-size: 12px; margin-top: 30px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 Welcome to Agno WorkSphere!</h1>
-                    <p>Your project management journey starts here</p>
-                </div>
-                
-                <div class="content">
-                    <h2>Hello {user_name}!</h2>
-                    
-                    <p>Congratulations! You've successfully created your Agno WorkSphere account and you're now the <strong>Owner</strong> of <strong>{organization_name}</strong>.</p>
-                    
-                    <p>As an organization owner, you have full control over your workspace and can:</p>
-                    
-                    <div class="features">
-                        <div class="feature">
-                            <strong>👥 Manage Team Members</strong><br>
-                            Invite team members and assign roles (Admin, Member, Viewer)
-                        </div>
-                        <div class="feature">
-                            <strong>📊 Create Projects</strong><br>
-                            Set up projects and organize work with Kanban boards
-                        </div>
-                        <div class="feature">
-                            <strong>🔒 Control Access</strong><br>
-                            Manage permissions and organization settings
-                        </div>
-                        <div class="feature">
-                            <strong>📈 Track Progress</strong><br>
-                            Monitor team activity and project progress
-                        </div>
-                    </div>
-                    
-                    <p>Ready to get started? Click the button below to access your dashboard:</p>
-                    
-                    <div style="text-align: center;">
-                        <a href="{login_url}" class="button">Access Your Dashboard</a>
-                    </div>
-                    
-                    <h3>🚀 Next Steps:</h3>
-                    <ol>
-                        <li><strong>Complete your profile</strong> - Add your avatar and personal information</li>
-                        <li><strong>Invite your team</strong> - Add team members to your organization</li>
-                        <li><strong>Create your first project</strong> - Start organizing your work</li>
-                        <li><strong>Set up Kanban boards</strong> - Visualize your workflow</li>
-                    </ol>
-                    
-                    <p>If you have any questions or need help getting started, don't hesitate to reach out to our support team.</p>
-                    
-                    <p>Welcome aboard!</p>
-                    <p><strong>The Agno WorkSphere Team</strong></p>
-                </div>
-                
-                <div class="footer">
-                    <p>This email was sent to {user_email}</p>
-                    <p>© 2024 Agno WorkSphere. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Welcome to Agno WorkSphere!
-        
-        Hello {user_name}!
-        
-        Congratulations! You've successfully created your Agno WorkSphere account and you're now the Owner of {organization_name}.
-        
-        As an organization owner, you have full control over your workspace and can:
-        - Manage team members and assign roles
-        - Create projects and organize work with Kanban boards
-        - Control access and organization settings
-        - Track progress and monitor team activity
-        
-        Ready to get started? Visit: {login_url}
-        
-        Next Steps:
-        1. Complete your profile
-        2. Invite your team
-        3. Create your first project
-        4. Set up Kanban boards
-        
-        Welcome aboard!
-        The Agno WorkSphere Team
-        """
-        
+        html_content, text_content = render_welcome(user_email, user_name, organization_name, login_url)
+
         return await self.send_email(user_email, subject, html_content, text_content)
     
     async def send_invitation_email(
@@ -211,57 +360,43 @@ class EmailService:
         """Send invitation email to new team member"""
         subject = f"You're invited to join {organization_name} on Agno WorkSphere"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Team Invitation</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-                .role-badge {{ background: #e3f2fd; color: #1976d2; padding: 5px 15px; border-radius: 20px; font-weight: bold; }}
-                .footer {{ text-align: center; color: #666; font-size: 12px; margin-top: 30px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 You're Invited!</h1>
-                    <p>Join {organization_name} on Agno WorkSphere</p>
-                </div>
-                
-                <div class="content">
-                    <p>Hello!</p>
-                    
-                    <p><strong>{inviter_name}</strong> has invited you to join <strong>{organization_name}</strong> on Agno WorkSphere as a <span class="role-badge">{role.title()}</span>.</p>
-                    
-                    <p>Agno WorkSphere is a powerful project management platform that helps teams collaborate effectively and get things done.</p>
-                    
-                    <div style="text-align: center;">
-                        <a href="{invitation_url}" class="button">Accept Invitation</a>
-                    </div>
-                    
-                    <p>If you don't have an account yet, you'll be able to create one when you click the invitation link.</p>
-                    
-                    <p>Looking forward to having you on the team!</p>
-                </div>
-                
-                <div class="footer">
-                    <p>This invitation was sent to {to_email}</p>
-                    <p>© 2024 Agno WorkSphere. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        html_content = fill_placeholders(
+            render_invitation_body(inviter_name, organization_name, role),
+            escape_html=True,
+            to_email=to_email,
+            invitation_url=invitation_url
+        )
         
         return await self.send_email(to_email, subject, html_content)
 
+    async def send_bulk_invitation_email(
+        self,
+        recipients: Iterable[str],
+        inviter_name: str,
+        organization_name: str,
+        role: str,
+        invitation_url_fn: Callable[[str], str]
+    ) -> List[bool]:
+        """
+        Send the same invitation to many recipients and return per-recipient
+        success flags
+
+        The body is rendered once; messages go out back to back over pooled
+        sessions (see send_many). ``invitation_url_fn`` maps a recipient's
+        email address to their invitation URL.
+        """
+        subject = f"You're invited to join {organization_name} on Agno WorkSphere"
+        body = render_invitation_body(inviter_name, organization_name, role)
+
+        return await self.send_many(
+            OutgoingEmail(
+                to_email,
+                subject,
+                fill_placeholders(body, escape_html=True, to_email=to_email, invitation_url=invitation_url_fn(to_email))
+            )
+            for to_email in recipients
+        )
+
     async def send_project_creation_confirmation(
         self,
         owner_email: str,
@@ -272,159 +407,9 @@ class EmailService:
         """Send project creation confirmation email to owner"""
         subject = f"🎉 AI Project '{project_data.get('name', 'Untitled')}' Created Successfully!"
 
-        # Extract project details
-        project_name = project_data.get('name', 'Untitled Project')
-        project_description = project_data.get('description', 'No description provided')
-        team_size = project_data.get('teamSize', 'Not specified')
-        industry = project_data.get('industry', 'Not specified')
-        tasks_created = len(project_data.get('tasks', []))
-        estimated_duration = project_data.get('estimatedDuration', 'Not specified')
-        tech_stack = project_data.get('techStack', {})
-        workflow_phases = project_data.get('workflow', {}).get('phases', [])
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Project Created Successfully</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #f8fafc; }}
-                .container {{ max-width: 600px; margin: 0 auto; background-color: white; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px 30px; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 28px; font-weight: 600; }}
-                .header p {{ margin: 10px 0 0 0; opacity: 0.9; font-size: 16px; }}
-                .content {{ padding: 40px 30px; }}
-                .project-card {{ background: #f8fafc; border-radius: 12px; padding: 24px; margin: 20px 0; border-left: 4px solid #667eea; }}
-                .project-title {{ font-size: 20px; font-weight: 600; color: #1a202c; margin: 0 0 8px 0; }}
-                .project-description {{ color: #4a5568; margin: 0 0 16px 0; line-height: 1.6; }}
-                .detail-grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 16px; margin: 20px 0; }}
-                .detail-item {{ background: white; padding: 16px; border-radius: 8px; border: 1px solid #e2e8f0; }}
-                .detail-label {{ font-size: 12px; font-weight: 600; color: #718096; text-transform: uppercase; margin-bottom: 4px; }}
-                .detail-value {{ font-size: 14px; color: #2d3748; font-weight: 500; }}
-                .tasks-section {{ background: #edf2f7; border-radius: 8px; padding: 20px; margin: 20px 0; }}
-                .tasks-count {{ font-size: 24px; font-weight: 700; color: #667eea; }}
-                .workflow-phases {{ margin: 20px 0; }}
-                .phase {{ background: white; padding: 12px 16px; margin: 8px 0; border-radius: 6px; border-left: 3px solid #48bb78; }}
-                .tech-stack {{ display: flex; flex-wrap: wrap; gap: 8px; margin: 12px 0; }}
-                .tech-item {{ background: #667eea; color: white; padding: 4px 12px; border-radius: 16px; font-size: 12px; }}
-                .cta-button {{ display: inline-block; background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; font-weight: 600; margin: 20px 0; }}
-                .footer {{ background: #f7fafc; padding: 30px; text-align: center; color: #718096; font-size: 14px; }}
-                @media (max-width: 600px) {{ .detail-grid {{ grid-template-columns: 1fr; }} }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 Project Created Successfully!</h1>
-                    <p>Your AI-powered project is ready to go</p>
-                </div>
-
-                <div class="content">
-                    <p>Hello <strong>{owner_name}</strong>,</p>
-
-                    <p>Great news! Your AI-powered project has been successfully created in <strong>{organization_name}</strong>. Our AI has generated a comprehensive project structure tailored to your needs.</p>
-
-                    <div class="project-card">
-                        <h2 class="project-title">{project_name}</h2>
-                        <p class="project-description">{project_description}</p>
-
-                        <div class="detail-grid">
-                            <div class="detail-item">
-                                <div class="detail-label">Industry</div>
-                                <div class="detail-value">{industry}</div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Team Size</div>
-                                <div class="detail-value">{team_size}</div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Estimated Duration</div>
-                                <div class="detail-value">{estimated_duration}</div>
-                            </div>
-                            <div class="detail-item">
-                                <div class="detail-label">Tasks Generated</div>
-                                <div class="detail-value">{tasks_created} tasks</div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <div class="tasks-section">
-                        <h3>📋 AI-Generated Project Structure</h3>
-                        <div class="tasks-count">{tasks_created}</div>
-                        <p>comprehensive tasks have been automatically generated and organized for your project.</p>
-                    </div>
-
-                    {f'''
-                    <div class="workflow-phases">
-                        <h3>🔄 Project Workflow Phases</h3>
-                        {''.join([f'<div class="phase">📌 {phase}</div>' for phase in workflow_phases[:5]])}
-                    </div>
-                    ''' if workflow_phases else ''}
-
-                    {f'''
-                    <div>
-                        <h3>🛠️ Recommended Technology Stack</h3>
-                        <div class="tech-stack">
-                            {''.join([f'<span class="tech-item">{tech}</span>' for tech in list(tech_stack.get('frontend', [])) + list(tech_stack.get('backend', [])) + list(tech_stack.get('database', []))][:8])}
-                        </div>
-                    </div>
-                    ''' if tech_stack else ''}
-
-                    <a href="http://localhost:3000/projects" class="cta-button">View Your Project →</a>
-
-                    <h3>🚀 What's Next?</h3>
-                    <ul>
-                        <li><strong>Review the generated tasks</strong> - Fine-tune the AI-generated task breakdown</li>
-                        <li><strong>Assign team members</strong> - Distribute tasks among your team</li>
-                        <li><strong>Set up your Kanban board</strong> - Visualize your project workflow</li>
-                        <li><strong>Start tracking progress</strong> - Monitor your project's advancement</li>
-                    </ul>
-
-                    <p>Our AI has done the heavy lifting of project planning for you. Now you can focus on what matters most - executing your vision!</p>
-
-                    <p>If you have any questions or need assistance, our support team is here to help.</p>
-
-                    <p>Happy project managing!</p>
-                    <p><strong>The Agno WorkSphere Team</strong></p>
-                </div>
-
-                <div class="footer">
-                    <p>This email was sent to {owner_email}</p>
-                    <p>© 2024 Agno WorkSphere. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-        text_content = f"""
-        Project Created Successfully!
-
-        Hello {owner_name}!
-
-        Great news! Your AI-powered project "{project_name}" has been successfully created in {organization_name}.
-
-        Project Details:
-        - Name: {project_name}
-        - Description: {project_description}
-        - Industry: {industry}
-        - Team Size: {team_size}
-        - Estimated Duration: {estimated_duration}
-        - Tasks Generated: {tasks_created} tasks
-
-        What's Next?
-        1. Review the generated tasks
-        2. Assign team members
-        3. Set up your Kanban board
-        4. Start tracking progress
-
-        View your project: http://localhost:3000/projects
-
-        Happy project managing!
-        The Agno WorkSphere Team
-        """
+        html_content, text_content = render_project_created(
+            owner_email, owner_name, project_data, organization_name
+        )
 
         return await self.send_email(owner_email, subject, html_content, text_content)
 
@@ -442,141 +427,14 @@ class EmailService:
         """Send enhanced invitation email with temporary password"""
         subject = f"🎉 You're invited to join {organization_name} on Agno WorkSphere"
 
-        # Role badge styling
-        role_colors = {
-            'owner': '#ff6b6b',
-            'admin': '#4ecdc4',
-            'member': '#45b7d1'
-        }
-        role_color = role_colors.get(role.lower(), '#45b7d1')
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Invitation to {organization_name}</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 0; background-color: #f5f7fa; }}
-                .container {{ max-width: 600px; margin: 0 auto; background: white; border-radius: 12px; overflow: hidden; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px 30px; text-align: center; position: relative; }}
-                .header::before {{ content: ''; position: absolute; top: 0; left: 0; right: 0; bottom: 0; background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grain" width="100" height="100" patternUnits="userSpaceOnUse"><circle cx="25" cy="25" r="1" fill="white" opacity="0.1"/><circle cx="75" cy="75" r="1" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23grain)"/></svg>'); }}
-                .header h1 {{ margin: 0; font-size: 28px; font-weight: 700; position: relative; z-index: 1; }}
-                .header .subtitle {{ margin: 10px 0 0 0; font-size: 16px; opacity: 0.9; position: relative; z-index: 1; }}
-                .content {{ padding: 40px 30px; }}
-                .invitation-card {{ background: linear-gradient(135deg, #f8f9ff 0%, #e8f4fd 100%); border-radius: 12px; padding: 30px; margin: 20px 0; border-left: 5px solid {role_color}; }}
-                .role-badge {{ display: inline-block; background: {role_color}; color: white; padding: 8px 16px; border-radius: 20px; font-size: 14px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px; margin: 10px 0; }}
-                .credentials-box {{ background: #f8f9fa; border: 2px dashed #dee2e6; border-radius: 8px; padding: 20px; margin: 20px 0; text-align: center; }}
-                .temp-password {{ font-family: 'Courier New', monospace; font-size: 18px; font-weight: bold; color: #e74c3c; background: white; padding: 10px 15px; border-radius: 6px; display: inline-block; margin: 10px 0; border: 2px solid #e74c3c; }}
-                .cta-button {{ display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 16px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; font-size: 16px; margin: 20px 0; transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3); }}
-                .cta-button:hover {{ transform: translateY(-2px); box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4); }}
-                .features {{ display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin: 30px 0; }}
-                .feature {{ text-align: center; padding: 20px; background: #f8f9ff; border-radius: 8px; }}
-                .feature-icon {{ font-size: 24px; margin-bottom: 10px; }}
-                .footer {{ background: #f8f9fa; padding: 30px; text-align: center; color: #6c757d; font-size: 14px; }}
-                .security-note {{ background: #fff3cd; border: 1px solid #ffeaa7; border-radius: 6px; padding: 15px; margin: 20px 0; color: #856404; }}
-                @media (max-width: 600px) {{
-                    .container {{ margin: 10px; }}
-                    .header {{ padding: 30px 20px; }}
-                    .content {{ padding: 30px 20px; }}
-                    .features {{ grid-template-columns: 1fr; }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 You're Invited!</h1>
-                    <p class="subtitle">Join {organization_name} on Agno WorkSphere</p>
-                </div>
-
-                <div class="content">
-                    <div class="invitation-card">
-                        <p><strong>{inviter_name}</strong> has invited you to join <strong>{organization_name}</strong> as a:</p>
-                        <div class="role-badge">{role.title()}</div>
-                        {f'<p><strong>Project:</strong> {project_name}</p>' if project_name else ''}
-                        {f'<div style="margin: 15px 0; padding: 15px; background: white; border-radius: 6px; font-style: italic;">"{custom_message}"</div>' if custom_message else ''}
-                    </div>
-
-                    <div class="credentials-box">
-                        <h3>🔐 Your Login Credentials</h3>
-                        <p><strong>Email:</strong> {to_email}</p>
-                        <p><strong>Temporary Password:</strong></p>
-                        <div class="temp-password">{temp_password}</div>
-                        <p style="font-size: 12px; color: #6c757d; margin-top: 15px;">
-                            ⚠️ Please change this password after your first login for security
-                        </p>
-                    </div>
-
-                    <div style="text-align: center;">
-                        <a href="{invitation_url}" class="cta-button">
-                            🚀 Accept Invitation & Get Started
-                        </a>
-                    </div>
-
-                    <div class="features">
-                        <div class="feature">
-                            <div class="feature-icon">📊</div>
-                            <h4>Project Management</h4>
-                            <p>Organize work with Kanban boards</p>
-                        </div>
-                        <div class="feature">
-                            <div class="feature-icon">👥</div>
-                            <h4>Team Collaboration</h4>
-                            <p>Work together seamlessly</p>
-                        </div>
-                        <div class="feature">
-                            <div class="feature-icon">📈</div>
-                            <h4>Progress Tracking</h4>
-                            <p>Monitor project progress</p>
-                        </div>
-                        <div class="feature">
-                            <div class="feature-icon">🔔</div>
-                            <h4>Smart Notifications</h4>
-                            <p>Stay updated on important changes</p>
-                        </div>
-                    </div>
-
-                    <div class="security-note">
-                        <strong>🛡️ Security Note:</strong> This invitation link is valid for 7 days.
-                        If you didn't expect this invitation, please ignore this email.
-                    </div>
-
-                    <p>Welcome to the team! We're excited to have you aboard.</p>
-                    <p><strong>The Agno WorkSphere Team</strong></p>
-                </div>
-
-                <div class="footer">
-                    <p>This invitation was sent to {to_email}</p>
-                    <p>© 2024 Agno WorkSphere. All rights reserved.</p>
-                    <p>Need help? Contact our support team</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-        text_content = f"""
-        You're invited to join {organization_name}!
-
-        Hello!
-
-        {inviter_name} has invited you to join {organization_name} on Agno WorkSphere as a {role.title()}.
-        {f'Project: {project_name}' if project_name else ''}
-        {f'Message: "{custom_message}"' if custom_message else ''}
-
-        Your login credentials:
-        Email: {to_email}
-        Temporary Password: {temp_password}
-
-        Accept your invitation: {invitation_url}
-
-        Please change your password after your first login for security.
-
-        Welcome to the team!
-        The Agno WorkSphere Team
-        """
+        # Bulk invitations share everything but the recipient, so the bodies
+        # are rendered once and only the recipient's values are filled in
+        html_body, text_body = render_enhanced_invitation_body(
+            inviter_name, organization_name, role, project_name, custom_message
+        )
+        recipient = dict(to_email=to_email, invitation_url=invitation_url, temp_password=temp_password)
+        html_content = fill_placeholders(html_body, escape_html=True, **recipient)
+        text_content = fill_placeholders(text_body, escape_html=False, **recipient)
 
         return await self.send_email(to_email, subject, html_content, text_content)
 
@@ -584,6 +442,74 @@ class EmailService:
 # Global email service instance
 email_service = EmailService()
 
+# Fire-and-forget sends go through a queue drained by one worker task per
+# pooled SMTP session, so the request that triggered them never waits on SMTP.
+# The queue holds at most settings.email_queue_max_size sends; beyond that new
+# sends are dropped rather than letting a stalled SMTP server grow memory
+_email_queue: Optional[asyncio.Queue] = None
+_email_workers: List[asyncio.Task] = []
+
+
+async def _email_worker(queue: asyncio.Queue) -> None:
+    """Run queued sends one at a time until cancelled"""
+    while True:
+        send_fn, args, kwargs = await queue.get()
+        try:
+            await send_fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background email send failed: {e}")
+        finally:
+            queue.task_done()
+
+
+def start_email_workers() -> asyncio.Queue:
+    """Start the background send workers if needed and return their queue"""
+    global _email_queue
+    if _email_queue is None:
+        _email_queue = asyncio.Queue(maxsize=settings.email_queue_max_size)
+        _email_workers.extend(
+            asyncio.create_task(_email_worker(_email_queue))
+            for _ in range(settings.smtp_pool_size)
+        )
+    return _email_queue
+
+
+async def stop_email_workers(timeout: float = 10.0) -> None:
+    """Let queued sends finish (up to ``timeout`` seconds), then stop the workers"""
+    global _email_queue
+    if _email_queue is None:
+        return
+
+    try:
+        await asyncio.wait_for(_email_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Dropping {_email_queue.qsize()} queued emails at shutdown")
+
+    for worker in _email_workers:
+        worker.cancel()
+    await asyncio.gather(*_email_workers, return_exceptions=True)
+    _email_workers.clear()
+    _email_queue = None
+
+
+def send_in_background(send_fn, *args, **kwargs) -> bool:
+    """
+    Queue an email send for the background workers without waiting for it,
+    so the request that triggered it can complete immediately
+
+    Returns:
+        False if the queue was full and the send was dropped
+    """
+    try:
+        start_email_workers().put_nowait((send_fn, args, kwargs))
+    except asyncio.QueueFull:
+        logger.warning(
+            "Email queue full (%s pending); dropping %s",
+            settings.email_queue_max_size, getattr(send_fn, "__name__", send_fn)
+        )
+        return False
+    return True
+
 
 # Convenience functions for backward compatibility
 async def send_invitation_email(
@@ -603,7 +529,7 @@ async def send_welcome_email(
     user_email: str,
     user_name: str,
     organization_name: str,
-    login_url: str = "http://localhost:3000/login"
+    login_url: str = DEFAULT_LOGIN_URL
 ) -> bool:
     """Send welcome email to new user"""
     return await email_service.send_welcome_email(
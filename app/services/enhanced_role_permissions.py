@@ -13,6 +13,7 @@ from app.models.organization_settings import OrganizationSettings
 from app.models.project import Project
 from app.models.card import Card, CardAssignment
 from app.core.exceptions import InsufficientPermissionsError
+from app.core.cache import cache_role
 
 
 class Permission(Enum):
@@ -77,134 +78,134 @@ class Permission(Enum):
 
 class EnhancedRolePermissions:
     """Enhanced role-based permission system"""
-    
-    def __init__(self, db: AsyncSession):
-        self.db = db
+
+    # Role permission table; built once at import rather than per instance
+    role_permissions = {
+        'owner': {
+            # Organization Management
+            Permission.CREATE_ORGANIZATION,
+            Permission.MANAGE_ORGANIZATION,
+            Permission.DELETE_ORGANIZATION,
+            Permission.UPDATE_ORG_SETTINGS,
+            
+            # Project Management
+            Permission.CREATE_PROJECT,
+            Permission.VIEW_ALL_PROJECTS,
+            Permission.UPDATE_PROJECT,
+            Permission.DELETE_PROJECT,
+            
+            # Member Management
+            Permission.INVITE_ADMIN,
+            Permission.INVITE_MEMBER,
+            Permission.PROMOTE_TO_ADMIN,
+            Permission.PROMOTE_TO_MEMBER,
+            Permission.DEMOTE_ADMIN,
+            Permission.DEMOTE_MEMBER,
+            Permission.REMOVE_MEMBER,
+            
+            # Task Management
+            Permission.CREATE_TASK,
+            Permission.ASSIGN_TASK,
+            Permission.VIEW_ALL_TASKS,
+            Permission.UPDATE_TASK,
+            Permission.DELETE_TASK,
+            
+            # Meeting Management
+            Permission.SCHEDULE_MEETING,
+            Permission.SCHEDULE_TEAM_MEETING,
+            Permission.SCHEDULE_INDIVIDUAL_MEETING,
+            Permission.JOIN_MEETING,
+            Permission.CANCEL_MEETING,
+            
+            # Kanban Board Operations
+            Permission.CREATE_BOARD,
+            Permission.UPDATE_BOARD,
+            Permission.DELETE_BOARD,
+            Permission.CREATE_COLUMN,
+            Permission.UPDATE_COLUMN,
+            Permission.DELETE_COLUMN,
+            Permission.CREATE_CARD,
+            Permission.UPDATE_OWN_CARD,
+            Permission.UPDATE_ANY_CARD,
+            Permission.DELETE_OWN_CARD,
+            Permission.DELETE_ANY_CARD,
+            Permission.MOVE_CARD,
+            
+            # Notification Management
+            Permission.SEND_NOTIFICATION,
+            Permission.VIEW_ALL_NOTIFICATIONS,
+            Permission.MANAGE_NOTIFICATION_SETTINGS,
+        },
         
-        # Define role permissions
-        self.role_permissions = {
-            'owner': {
-                # Organization Management
-                Permission.CREATE_ORGANIZATION,
-                Permission.MANAGE_ORGANIZATION,
-                Permission.DELETE_ORGANIZATION,
-                Permission.UPDATE_ORG_SETTINGS,
-                
-                # Project Management
-                Permission.CREATE_PROJECT,
-                Permission.VIEW_ALL_PROJECTS,
-                Permission.UPDATE_PROJECT,
-                Permission.DELETE_PROJECT,
-                
-                # Member Management
-                Permission.INVITE_ADMIN,
-                Permission.INVITE_MEMBER,
-                Permission.PROMOTE_TO_ADMIN,
-                Permission.PROMOTE_TO_MEMBER,
-                Permission.DEMOTE_ADMIN,
-                Permission.DEMOTE_MEMBER,
-                Permission.REMOVE_MEMBER,
-                
-                # Task Management
-                Permission.CREATE_TASK,
-                Permission.ASSIGN_TASK,
-                Permission.VIEW_ALL_TASKS,
-                Permission.UPDATE_TASK,
-                Permission.DELETE_TASK,
-                
-                # Meeting Management
-                Permission.SCHEDULE_MEETING,
-                Permission.SCHEDULE_TEAM_MEETING,
-                Permission.SCHEDULE_INDIVIDUAL_MEETING,
-                Permission.JOIN_MEETING,
-                Permission.CANCEL_MEETING,
-                
-                # Kanban Board Operations
-                Permission.CREATE_BOARD,
-                Permission.UPDATE_BOARD,
-                Permission.DELETE_BOARD,
-                Permission.CREATE_COLUMN,
-                Permission.UPDATE_COLUMN,
-                Permission.DELETE_COLUMN,
-                Permission.CREATE_CARD,
-                Permission.UPDATE_OWN_CARD,
-                Permission.UPDATE_ANY_CARD,
-                Permission.DELETE_OWN_CARD,
-                Permission.DELETE_ANY_CARD,
-                Permission.MOVE_CARD,
-                
-                # Notification Management
-                Permission.SEND_NOTIFICATION,
-                Permission.VIEW_ALL_NOTIFICATIONS,
-                Permission.MANAGE_NOTIFICATION_SETTINGS,
-            },
+        'admin': {
+            # Project Management (if allowed by org settings)
+            Permission.VIEW_ALL_PROJECTS,
+            Permission.UPDATE_PROJECT,
+            
+            # Member Management (limited)
+            Permission.INVITE_MEMBER,
+            Permission.PROMOTE_TO_MEMBER,
+            Permission.DEMOTE_MEMBER,
             
-            'admin': {
-                # Project Management (if allowed by org settings)
-                Permission.VIEW_ALL_PROJECTS,
-                Permission.UPDATE_PROJECT,
-                
-                # Member Management (limited)
-                Permission.INVITE_MEMBER,
-                Permission.PROMOTE_TO_MEMBER,
-                Permission.DEMOTE_MEMBER,
-                
-                # Task Management
-                Permission.CREATE_TASK,
-                Permission.ASSIGN_TASK,
-                Permission.VIEW_ALL_TASKS,
-                Permission.UPDATE_TASK,
-                Permission.DELETE_TASK,
-                
-                # Meeting Management (if allowed by org settings)
-                Permission.JOIN_MEETING,
-                
-                # Kanban Board Operations
-                Permission.CREATE_BOARD,
-                Permission.UPDATE_BOARD,
-                Permission.CREATE_COLUMN,
-                Permission.UPDATE_COLUMN,
-                Permission.CREATE_CARD,
-                Permission.UPDATE_OWN_CARD,
-                Permission.UPDATE_ANY_CARD,
-                Permission.DELETE_OWN_CARD,
-                Permission.DELETE_ANY_CARD,
-                Permission.MOVE_CARD,
-                
-                # Notification Management
-                Permission.SEND_NOTIFICATION,
-                Permission.VIEW_ALL_NOTIFICATIONS,
-            },
+            # Task Management
+            Permission.CREATE_TASK,
+            Permission.ASSIGN_TASK,
+            Permission.VIEW_ALL_TASKS,
+            Permission.UPDATE_TASK,
+            Permission.DELETE_TASK,
             
-            'member': {
-                # Project Management
-                Permission.VIEW_ASSIGNED_PROJECTS,
-
-                # Task Management
-                Permission.VIEW_ASSIGNED_TASKS,
-                Permission.ACCEPT_TASK,
-                Permission.UPDATE_OWN_CARD,  # Only own assigned cards
-
-                # Meeting Management
-                Permission.JOIN_MEETING,
-
-                # Kanban Board Operations (limited to own content)
-                Permission.CREATE_BOARD,  # Can create boards
-                Permission.UPDATE_BOARD,  # Only own boards (checked in _check_resource_permission)
-                Permission.DELETE_BOARD,  # Only own boards (checked in _check_resource_permission)
-                Permission.CREATE_CARD,  # Can create cards
-                Permission.UPDATE_OWN_CARD,  # Only own cards
-                Permission.DELETE_OWN_CARD,  # Only own cards
-                Permission.MOVE_CARD,  # Only own cards
-            },
+            # Meeting Management (if allowed by org settings)
+            Permission.JOIN_MEETING,
             
-            'viewer': {
-                # Very limited permissions
-                Permission.VIEW_ASSIGNED_PROJECTS,
-                Permission.VIEW_ASSIGNED_TASKS,
-                Permission.JOIN_MEETING,
-            }
+            # Kanban Board Operations
+            Permission.CREATE_BOARD,
+            Permission.UPDATE_BOARD,
+            Permission.CREATE_COLUMN,
+            Permission.UPDATE_COLUMN,
+            Permission.CREATE_CARD,
+            Permission.UPDATE_OWN_CARD,
+            Permission.UPDATE_ANY_CARD,
+            Permission.DELETE_OWN_CARD,
+            Permission.DELETE_ANY_CARD,
+            Permission.MOVE_CARD,
+            
+            # Notification Management
+            Permission.SEND_NOTIFICATION,
+            Permission.VIEW_ALL_NOTIFICATIONS,
+        },
+        
+        'member': {
+            # Project Management
+            Permission.VIEW_ASSIGNED_PROJECTS,
+
+            # Task Management
+            Permission.VIEW_ASSIGNED_TASKS,
+            Permission.ACCEPT_TASK,
+            Permission.UPDATE_OWN_CARD,  # Only own assigned cards
+
+            # Meeting Management
+            Permission.JOIN_MEETING,
+
+            # Kanban Board Operations (limited to own content)
+            Permission.CREATE_BOARD,  # Can create boards
+            Permission.UPDATE_BOARD,  # Only own boards (checked in _check_resource_permission)
+            Permission.DELETE_BOARD,  # Only own boards (checked in _check_resource_permission)
+            Permission.CREATE_CARD,  # Can create cards
+            Permission.UPDATE_OWN_CARD,  # Only own cards
+            Permission.DELETE_OWN_CARD,  # Only own cards
+            Permission.MOVE_CARD,  # Only own cards
+        },
+        
+        'viewer': {
+            # Very limited permissions
+            Permission.VIEW_ASSIGNED_PROJECTS,
+            Permission.VIEW_ASSIGNED_TASKS,
+            Permission.JOIN_MEETING,
         }
+    }
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
 
     async def check_permission(
         self, 
@@ -240,8 +241,9 @@ class EnhancedRolePermissions:
         except Exception:
             return False
 
+    @cache_role()
     async def get_user_role(self, user_id: str, organization_id: str) -> Optional[str]:
-        """Get user's role in organization"""
+        """Get user's role in organization (cached for ROLE_CACHE_TTL seconds)"""
         result = await self.db.execute(
             select(OrganizationMember.role)
             .where(
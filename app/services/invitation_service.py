@@ -3,15 +3,12 @@ Email Domain-Based Invitation Service
 Handle organization domain-based email invitations with temporary passwords
 """
 import secrets
-import string
-import smtplib
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from itertools import chain
+from typing import Optional, Dict, Any, FrozenSet, NamedTuple, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, insert, func, and_, exists
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +17,35 @@ from app.models.organization import Organization, OrganizationMember
 from app.models.organization_settings import InvitationToken, OrganizationSettings
 from app.models.project import Project
 from app.models.notification import Notification
-from app.core.security import hash_password, verify_password
+from app.core.security import (
+    hash_password_async,
+    hash_temporary_password_async,
+    verify_temporary_password_async
+)
+from app.core.cache import cache, invalidate_member_caches
 from app.core.exceptions import ValidationError, ResourceNotFoundError
-from app.config import settings
-from app.services.email_service import email_service
+from app.services.email_service import email_service, send_in_background
+
+# Seconds an organization's invitation domain policy is reused before reload
+DOMAIN_POLICY_TTL = 60
+
+# Frontend accept page; the invitation token is appended
+ACCEPT_INVITATION_URL = "http://localhost:3000/accept-invitation?token="
+
+
+class DomainPolicy(NamedTuple):
+    """Lowercased allowed invitation domains and their error-message listing"""
+    domains: FrozenSet[str]
+    listing: str
+
+
+def _domain_policy_key(organization_id) -> str:
+    return f"invitation_domains:{organization_id}"
+
+
+def invalidate_invitation_domain_policy(organization_id) -> None:
+    """Drop the cached domain policy after an organization or its settings change"""
+    cache.delete(_domain_policy_key(organization_id))
 
 
 class InvitationService:
@@ -43,15 +65,17 @@ class InvitationService:
     ) -> Dict[str, Any]:
         """Send organization invitation with domain validation"""
         
+        # Normalized once; stored, looked up and domain-checked in this form
+        normalized_email = email.lower().strip()
+
         # Validate email domain
-        await self._validate_email_domain(email, organization_id)
+        await self._validate_email_domain(normalized_email, organization_id)
         
         # Check if user already exists
-        existing_user = await self._get_user_by_email(email)
+        existing_user = await self._get_user_by_email(normalized_email)
         if existing_user:
             # Check if already member
-            existing_member = await self._get_organization_member(existing_user.id, organization_id)
-            if existing_member:
+            if await self._is_organization_member(existing_user.id, organization_id):
                 raise ValidationError("User is already a member of this organization")
         
         # Generate invitation token and temporary password
@@ -61,39 +85,28 @@ class InvitationService:
         # Create invitation record
         invitation = InvitationToken(
             token=token,
-            email=email.lower().strip(),
+            email=normalized_email,
             organization_id=organization_id,
             project_id=project_id,
             invited_role=invited_role,
-            temporary_password=hash_password(temp_password),
+            temporary_password=await hash_temporary_password_async(temp_password),
             invited_by=inviter_id,
             invitation_message=message,
             expires_at=datetime.utcnow() + timedelta(days=7)
         )
         
+        # Flush assigns invitation.id; the invitation and the notification
+        # below are committed together in a single transaction
         self.db.add(invitation)
-        await self.db.commit()
-        await self.db.refresh(invitation)
-        
-        # Get organization and inviter details
-        org_details = await self._get_organization_details(organization_id)
-        inviter_details = await self._get_user_details(inviter_id)
-        project_details = await self._get_project_details(project_id) if project_id else None
+        await self.db.flush()
         
-        # Send invitation email
-        email_sent = await self._send_invitation_email(
-            email=email,
-            token=token,
-            temp_password=temp_password,
-            organization=org_details,
-            inviter=inviter_details,
-            project=project_details,
-            role=invited_role,
-            message=message
+        # Get organization, inviter and project details
+        org_details, inviter_details, project_details = await self._get_invitation_details(
+            organization_id, inviter_id, project_id
         )
 
-        # Create notification for the invited user (if they already exist in the system)
-        existing_user = await self._get_user_by_email(email)
+        # Create notification for the invited user (if they already exist in
+        # the system); reuses the lookup made before the invitation was created
         if existing_user:
             notification = Notification(
                 user_id=existing_user.id,
@@ -112,7 +125,20 @@ class InvitationService:
                 }
             )
             self.db.add(notification)
-            await self.db.commit()
+
+        await self.db.commit()
+
+        # Queue the invitation email once the invitation is persisted
+        email_sent = self._send_invitation_email(
+            email=normalized_email,
+            token=token,
+            temp_password=temp_password,
+            organization=org_details,
+            inviter=inviter_details,
+            project=project_details,
+            role=invited_role,
+            message=message
+        )
 
         return {
             'invitation_id': str(invitation.id),
@@ -144,7 +170,7 @@ class InvitationService:
             raise ValidationError("Invitation has expired")
         
         # Verify temporary password
-        if not verify_password(temp_password, invitation.temporary_password):
+        if not await verify_temporary_password_async(temp_password, invitation.temporary_password):
             raise ValidationError("Invalid temporary password")
         
         # Check if user already exists
@@ -152,7 +178,7 @@ class InvitationService:
         
         if existing_user:
             # Update existing user's password
-            existing_user.hashed_password = hash_password(new_password)
+            existing_user.password_hash = await hash_password_async(new_password)
             user = existing_user
         else:
             # Create new user
@@ -160,7 +186,7 @@ class InvitationService:
                 email=invitation.email,
                 first_name=first_name,
                 last_name=last_name,
-                hashed_password=hash_password(new_password),
+                password_hash=await hash_password_async(new_password),
                 is_active=True,
                 email_verified=True
             )
@@ -168,8 +194,7 @@ class InvitationService:
             await self.db.flush()  # Get user ID
         
         # Add user to organization
-        existing_member = await self._get_organization_member(user.id, invitation.organization_id)
-        if not existing_member:
+        if not await self._is_organization_member(user.id, invitation.organization_id):
             member = OrganizationMember(
                 organization_id=invitation.organization_id,
                 user_id=user.id,
@@ -182,43 +207,45 @@ class InvitationService:
         invitation.is_used = True
         invitation.used_at = datetime.utcnow()
 
-        # Create welcome notification for the new member
+        # Welcome the new member and notify the inviter in one multi-row
+        # INSERT; it autoflushes the user, membership and invitation first
         org_details = await self._get_organization_details(str(invitation.organization_id))
-        welcome_notification = Notification(
-            user_id=user.id,
-            organization_id=invitation.organization_id,
-            title=f"Welcome to {org_details['name']}!",
-            message=f"You've successfully joined {org_details['name']} as a {invitation.invited_role}. Start exploring your new workspace!",
-            type="team_invite_accepted",
-            priority="normal",
-            action_url="/dashboard",
-            notification_metadata={
-                'organization_name': org_details['name'],
-                'role': invitation.invited_role,
-                'project_id': str(invitation.project_id) if invitation.project_id else None
-            }
-        )
-        self.db.add(welcome_notification)
-
-        # Notify the inviter that invitation was accepted
-        inviter_notification = Notification(
-            user_id=invitation.invited_by,
-            organization_id=invitation.organization_id,
-            title="Invitation Accepted",
-            message=f"{user.first_name} {user.last_name} ({invitation.email}) has joined {org_details['name']}",
-            type="team_invite_accepted",
-            priority="normal",
-            action_url="/team-members",
-            notification_metadata={
-                'new_member_name': f"{user.first_name} {user.last_name}",
-                'new_member_email': invitation.email,
-                'role': invitation.invited_role,
-                'organization_name': org_details['name']
-            }
+        await self.db.execute(
+            insert(Notification).values([
+                {
+                    'user_id': user.id,
+                    'organization_id': invitation.organization_id,
+                    'title': f"Welcome to {org_details['name']}!",
+                    'message': f"You've successfully joined {org_details['name']} as a {invitation.invited_role}. Start exploring your new workspace!",
+                    'type': "team_invite_accepted",
+                    'priority': "normal",
+                    'action_url': "/dashboard",
+                    'notification_metadata': {
+                        'organization_name': org_details['name'],
+                        'role': invitation.invited_role,
+                        'project_id': str(invitation.project_id) if invitation.project_id else None
+                    }
+                },
+                {
+                    'user_id': invitation.invited_by,
+                    'organization_id': invitation.organization_id,
+                    'title': "Invitation Accepted",
+                    'message': f"{user.first_name} {user.last_name} ({invitation.email}) has joined {org_details['name']}",
+                    'type': "team_invite_accepted",
+                    'priority': "normal",
+                    'action_url': "/team-members",
+                    'notification_metadata': {
+                        'new_member_name': f"{user.first_name} {user.last_name}",
+                        'new_member_email': invitation.email,
+                        'role': invitation.invited_role,
+                        'organization_name': org_details['name']
+                    }
+                }
+            ])
         )
-        self.db.add(inviter_notification)
 
         await self.db.commit()
+        invalidate_member_caches(invitation.organization_id, user.id)
 
         return {
             'user_id': str(user.id),
@@ -228,9 +255,20 @@ class InvitationService:
         }
     
     async def get_pending_invitations(self, organization_id: str) -> list:
-        """Get pending invitations for organization"""
+        """Get pending invitations for organization, with the inviter's name"""
         result = await self.db.execute(
-            select(InvitationToken)
+            select(
+                InvitationToken.id,
+                InvitationToken.email,
+                InvitationToken.invited_role,
+                InvitationToken.project_id,
+                InvitationToken.invited_by,
+                InvitationToken.created_at,
+                InvitationToken.expires_at,
+                User.first_name,
+                User.last_name
+            )
+            .join(User, User.id == InvitationToken.invited_by)
             .where(
                 and_(
                     InvitationToken.organization_id == organization_id,
@@ -241,18 +279,19 @@ class InvitationService:
             .order_by(InvitationToken.created_at.desc())
         )
         
-        invitations = result.scalars().all()
         return [
             {
-                'id': str(inv.id),
-                'email': inv.email,
-                'role': inv.invited_role,
-                'project_id': str(inv.project_id) if inv.project_id else None,
-                'invited_by': str(inv.invited_by),
-                'created_at': inv.created_at.isoformat(),
-                'expires_at': inv.expires_at.isoformat()
+                'id': str(invitation_id),
+                'email': email,
+                'role': role,
+                'project_id': str(project_id) if project_id else None,
+                'invited_by': str(invited_by),
+                'inviter_name': f"{first_name} {last_name}",
+                'created_at': created_at.isoformat(),
+                'expires_at': expires_at.isoformat()
             }
-            for inv in invitations
+            for (invitation_id, email, role, project_id, invited_by,
+                 created_at, expires_at, first_name, last_name) in result
         ]
     
     async def cancel_invitation(self, invitation_id: str, user_id: str) -> bool:
@@ -278,62 +317,83 @@ class InvitationService:
     
     async def _validate_email_domain(self, email: str, organization_id: str):
         """Validate email domain against organization settings"""
-        email_domain = email.split('@')[1].lower()
-        
-        # Get organization settings
-        settings_result = await self.db.execute(
-            select(OrganizationSettings)
-            .where(OrganizationSettings.organization_id == organization_id)
-        )
-        
-        org_settings = settings_result.scalar_one_or_none()
-        if not org_settings or not org_settings.require_domain_match:
-            return  # No domain validation required
-        
-        # Get organization domain info
-        org_result = await self.db.execute(
-            select(Organization.domain, Organization.allowed_domains)
-            .where(Organization.id == organization_id)
-        )
-        
-        org_data = org_result.first()
-        if not org_data:
-            raise ValidationError("Organization not found")
-        
-        # Build allowed domains list
-        allowed_domains = []
-        if org_data.domain:
-            allowed_domains.append(org_data.domain.lower())
-        if org_data.allowed_domains:
-            allowed_domains.extend([d.lower() for d in org_data.allowed_domains])
-        if org_settings.allowed_invitation_domains:
-            allowed_domains.extend([d.lower() for d in org_settings.allowed_invitation_domains])
-        
-        if allowed_domains and email_domain not in allowed_domains:
+        email_domain = email.rpartition('@')[2].lower()
+
+        policy = await self._get_domain_policy(organization_id)
+        if policy and email_domain not in policy.domains:
             raise ValidationError(
                 f"Email domain '{email_domain}' is not allowed. "
-                f"Allowed domains: {', '.join(allowed_domains)}"
+                f"Allowed domains: {policy.listing}"
+            )
+
+    async def _get_domain_policy(self, organization_id: str) -> Optional[DomainPolicy]:
+        """
+        Domains invitations may be sent to, or None when the organization
+        does not restrict them. Cached per organization for
+        DOMAIN_POLICY_TTL seconds, so bulk invites load it once.
+        """
+        cache_key = _domain_policy_key(organization_id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached[0]
+
+        # Settings are outer-joined: an organization without a settings row
+        # has no domain restriction
+        result = await self.db.execute(
+            select(
+                Organization.domain,
+                Organization.allowed_domains,
+                OrganizationSettings.require_domain_match,
+                OrganizationSettings.allowed_invitation_domains
+            )
+            .select_from(Organization)
+            .outerjoin(OrganizationSettings, OrganizationSettings.organization_id == Organization.id)
+            .where(Organization.id == organization_id)
+        )
+        row = result.first()
+
+        policy = None
+        if row and row.require_domain_match:
+            domains = frozenset(
+                domain.lower()
+                for domain in chain(
+                    (row.domain,) if row.domain else (),
+                    row.allowed_domains or (),
+                    row.allowed_invitation_domains or ()
+                )
             )
+            if domains:
+                policy = DomainPolicy(domains, ', '.join(sorted(domains)))
+
+        # Wrapped so a cached "no restriction" (None) is distinguishable from a miss
+        cache.set(cache_key, (policy,), ttl=DOMAIN_POLICY_TTL)
+        return policy
     
     async def _get_user_by_email(self, email: str) -> Optional[User]:
-        """Get user by email"""
+        """
+        Get user by an already lowercased email, matching stored emails
+        case-insensitively via the lower(email) index. Accounts differing only
+        in case predate email normalization; the oldest one is returned.
+        """
         result = await self.db.execute(
-            select(User).where(User.email == email.lower())
+            select(User)
+            .where(func.lower(User.email) == email)
+            .order_by(User.created_at)
         )
-        return result.scalar_one_or_none()
+        return result.scalars().first()
     
-    async def _get_organization_member(self, user_id: str, organization_id: str) -> Optional[OrganizationMember]:
-        """Get organization member"""
-        result = await self.db.execute(
-            select(OrganizationMember)
-            .where(
-                and_(
-                    OrganizationMember.user_id == user_id,
-                    OrganizationMember.organization_id == organization_id
+    async def _is_organization_member(self, user_id: str, organization_id: str) -> bool:
+        """Check membership with an EXISTS probe on the (organization_id, user_id) unique index"""
+        return await self.db.scalar(
+            select(
+                exists().where(
+                    and_(
+                        OrganizationMember.user_id == user_id,
+                        OrganizationMember.organization_id == organization_id
+                    )
                 )
             )
         )
-        return result.scalar_one_or_none()
     
     async def _get_invitation_by_token(self, token: str) -> Optional[InvitationToken]:
         """Get invitation by token"""
@@ -345,42 +405,71 @@ class InvitationService:
     async def _get_organization_details(self, organization_id: str) -> Dict[str, Any]:
         """Get organization details"""
         result = await self.db.execute(
-            select(Organization).where(Organization.id == organization_id)
+            select(
+                Organization.id,
+                Organization.name,
+                Organization.description,
+                Organization.domain
+            ).where(Organization.id == organization_id)
         )
-        org = result.scalar_one_or_none()
-        return {
-            'id': str(org.id),
-            'name': org.name,
-            'description': org.description,
-            'domain': org.domain
-        } if org else {}
+        row = result.mappings().first()
+        return {**row, 'id': str(row['id'])} if row else {}
     
-    async def _get_user_details(self, user_id: str) -> Dict[str, Any]:
-        """Get user details"""
-        result = await self.db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return {
-            'id': str(user.id),
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        } if user else {}
-    
-    async def _get_project_details(self, project_id: str) -> Optional[Dict[str, Any]]:
-        """Get project details"""
-        result = await self.db.execute(
-            select(Project).where(Project.id == project_id)
-        )
-        project = result.scalar_one_or_none()
-        return {
-            'id': str(project.id),
-            'name': project.name,
-            'description': project.description
-        } if project else None
-    
-    async def _send_invitation_email(
+    async def _get_invitation_details(
+        self,
+        organization_id: str,
+        inviter_id: str,
+        project_id: Optional[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Get organization, inviter and project details in one query"""
+        columns = [
+            Organization.id.label('org_id'),
+            Organization.name.label('org_name'),
+            Organization.description.label('org_description'),
+            Organization.domain.label('org_domain'),
+            User.id.label('inviter_id'),
+            User.first_name,
+            User.last_name,
+            User.email
+        ]
+        if project_id:
+            columns += [
+                Project.id.label('project_id'),
+                Project.name.label('project_name'),
+                Project.description.label('project_description')
+            ]
+
+        # Inviter and project are outer-joined on their ids, so a missing
+        # row leaves its columns NULL instead of dropping the organization
+        query = select(*columns).select_from(Organization).outerjoin(User, User.id == inviter_id)
+        if project_id:
+            query = query.outerjoin(Project, Project.id == project_id)
+
+        result = await self.db.execute(query.where(Organization.id == organization_id))
+        row = result.mappings().first()
+        if not row:
+            return {}, {}, None
+
+        org = {
+            'id': str(row['org_id']),
+            'name': row['org_name'],
+            'description': row['org_description'],
+            'domain': row['org_domain']
+        }
+        inviter = {
+            'id': str(row['inviter_id']),
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+            'email': row['email']
+        } if row['inviter_id'] else {}
+        project = {
+            'id': str(row['project_id']),
+            'name': row['project_name'],
+            'description': row['project_description']
+        } if project_id and row['project_id'] else None
+        return org, inviter, project
+
+    def _send_invitation_email(
         self,
         email: str,
         token: str,
@@ -391,13 +480,16 @@ class InvitationService:
         role: str,
         message: Optional[str]
     ) -> bool:
-        """Send invitation email"""
+        """
+        Queue the invitation email for the background send workers. Returns
+        True once queued; SMTP failures are logged by the email service.
+        """
         try:
-            # Create invitation URL
-            invitation_url = f"http://localhost:3000/accept-invitation?token={token}"
+            invitation_url = ACCEPT_INVITATION_URL + token
 
             # Send enhanced invitation email using centralized service
-            return await email_service.send_enhanced_invitation_email(
+            send_in_background(
+                email_service.send_enhanced_invitation_email,
                 to_email=email,
                 inviter_name=f"{inviter['first_name']} {inviter['last_name']}",
                 organization_name=organization['name'],
@@ -407,105 +499,17 @@ class InvitationService:
                 project_name=project['name'] if project else None,
                 custom_message=message
             )
+            return True
 
         except Exception as e:
-            print(f"❌ Failed to send invitation email: {str(e)}")
-            logger.error(f"Failed to send invitation email to {email}: {str(e)}")
+            logger.error(f"Failed to queue invitation email to {email}: {str(e)}")
             return False
     
-    def _create_invitation_email_html(
-        self,
-        email: str,
-        token: str,
-        temp_password: str,
-        organization: Dict[str, Any],
-        inviter: Dict[str, Any],
-        project: Optional[Dict[str, Any]],
-        role: str,
-        message: Optional[str]
-    ) -> str:
-        """Create HTML email body for invitation"""
-        project_info = f"<p><strong>Project:</strong> {project['name']}</p>" if project else ""
-        custom_message = f"<p><strong>Message from {inviter['first_name']}:</strong><br>{message}</p>" if message else ""
-        
-        return f"""
-        <html>
-        <body>
-            <h2>You're invited to join {organization['name']}!</h2>
-            
-            <p>Hello,</p>
-            
-            <p>{inviter['first_name']} {inviter['last_name']} has invited you to join <strong>{organization['name']}</strong> as a <strong>{role}</strong>.</p>
-            
-            {project_info}
-            {custom_message}
-            
-            <h3>Getting Started:</h3>
-            <ol>
-                <li>Click the link below to accept the invitation</li>
-                <li>Use the temporary password provided to log in</li>
-                <li>Set up your new password</li>
-                <li>Start collaborating!</li>
-            </ol>
-            
-            <p><strong>Invitation Token:</strong> {token}</p>
-            <p><strong>Temporary Password:</strong> {temp_password}</p>
-            
-            <p><a href="{settings.FRONTEND_URL}/accept-invitation?token={token}" 
-               style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
-               Accept Invitation
-            </a></p>
-            
-            <p><small>This invitation will expire in 7 days.</small></p>
-            
-            <p>Best regards,<br>The {organization['name']} Team</p>
-        </body>
-        </html>
-        """
-    
     def _generate_secure_token(self) -> str:
         """Generate secure invitation token"""
         return secrets.token_urlsafe(32)
     
     def _generate_temporary_password(self) -> str:
         """Generate temporary password"""
-        alphabet = string.ascii_letters + string.digits + "!@#$%"
-        return ''.join(secrets.choice(alphabet) for _ in range(12))
-
-
-# --- PATCH: Stronger domain validation override ---
-async def _validate_email_domain(self, email: str, organization_id: str):
-    """Validate email domain against organization & settings (patched)."""
-    email_domain = email.split('@')[1].lower()
-
-    # Load settings (may be None)
-    settings_result = await self.db.execute(
-        select(OrganizationSettings).where(OrganizationSettings.organization_id == organization_id)
-    )
-    org_settings = settings_result.scalar_one_or_none()
-
-    # If settings explicitly disable domain matching, allow
-    if org_settings and not org_settings.require_domain_match:
-        return
-
-    # Build allowed domains from Organization + Settings
-    org_result = await self.db.execute(
-        select(Organization.domain, Organization.allowed_domains).where(Organization.id == organization_id)
-    )
-    org_data = org_result.first()
-
-    allowed_domains = []
-    if org_data:
-        if org_data.domain:
-            allowed_domains.append(org_data.domain.lower())
-        if org_data.allowed_domains:
-            allowed_domains.extend([d.lower() for d in org_data.allowed_domains])
-
-    if org_settings and getattr(org_settings, "allowed_invitation_domains", None):
-        allowed_domains.extend([d.lower() for d in org_settings.allowed_invitation_domains])
-
-    # If any allowed domains exist, enforce
-    if allowed_domains and email_domain not in set(allowed_domains):
-        raise ValidationError(
-            f"Email domain '{email_domain}' is not allowed. Allowed domains: {', '.join(sorted(set(allowed_domains)))}"
-        )
+        # 12 URL-safe characters from a single random read
+        return secrets.token_urlsafe(9)
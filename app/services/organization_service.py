@@ -3,7 +3,6 @@ Enhanced Organization Service
 Multi-organization management with role-based access control
 """
 import secrets
-import string
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,10 +16,27 @@ from app.models.organization_settings import (
 )
 from app.models.project import Project
 from app.core.exceptions import ValidationError, ResourceNotFoundError, InsufficientPermissionsError
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_temporary_password_async
 from app.schemas.organization_enhanced import DashboardPermissions
 
 
+# Everything the invitation domain check needs, fetched in one round trip.
+# The outer join yields NULL settings columns for organizations that have
+# never saved settings; require_domain_match then defaults to on.
+_INVITATION_DOMAIN_POLICY = (
+    select(
+        Organization.domain,
+        Organization.allowed_domains,
+        OrganizationSettings.require_domain_match,
+        OrganizationSettings.allowed_invitation_domains,
+    )
+    .outerjoin(
+        OrganizationSettings,
+        OrganizationSettings.organization_id == Organization.id
+    )
+)
+
+
 class OrganizationService:
     """Enhanced organization management service"""
 
@@ -190,24 +206,21 @@ class OrganizationService:
     ) -> InvitationToken:
         """Generate invitation token with temporary password"""
         # Check if organization allows this invitation
-        org_settings = await self._get_organization_settings(organization_id)
-        
-        if org_settings.require_domain_match:
-            email_domain = email.split('@')[1].lower()
-            allowed_domains = org_settings.allowed_invitation_domains or []
-            
-            # Get organization domain
-            org_result = await self.db.execute(
-                select(Organization.domain, Organization.allowed_domains)
-                .where(Organization.id == organization_id)
-            )
-            org_data = org_result.first()
-            
-            if org_data and org_data.domain:
-                allowed_domains.append(org_data.domain.lower())
-            if org_data and org_data.allowed_domains:
-                allowed_domains.extend([d.lower() for d in org_data.allowed_domains])
-            
+        email_domain = email.rpartition('@')[2].lower()
+        policy_result = await self.db.execute(
+            _INVITATION_DOMAIN_POLICY.where(Organization.id == organization_id)
+        )
+        policy = policy_result.first()
+        if policy is None:
+            raise ResourceNotFoundError("Organization not found")
+
+        if policy.require_domain_match is not False:
+            allowed_domains = list(policy.allowed_invitation_domains or [])
+            if policy.domain:
+                allowed_domains.append(policy.domain)
+            allowed_domains.extend(policy.allowed_domains or [])
+            allowed_domains = {d.lower() for d in allowed_domains if isinstance(d, str)}
+
             if allowed_domains and email_domain not in allowed_domains:
                 raise ValidationError(f"Email domain {email_domain} is not allowed for this organization")
         
@@ -222,7 +235,7 @@ class OrganizationService:
             organization_id=organization_id,
             project_id=project_id,
             invited_role=invited_role,
-            temporary_password=hash_password(temp_password),
+            temporary_password=await hash_temporary_password_async(temp_password),
             invited_by=inviter_id,
             invitation_message=message,
             expires_at=datetime.utcnow() + timedelta(days=7)  # 7 days expiry
@@ -315,5 +328,5 @@ class OrganizationService:
 
     def _generate_temporary_password(self) -> str:
         """Generate temporary password"""
-        alphabet = string.ascii_letters + string.digits
-        return ''.join(secrets.choice(alphabet) for _ in range(12))
+        # 12 URL-safe characters from a single random read
+        return secrets.token_urlsafe(9)
@@ -29,8 +29,9 @@ class SessionService:
     ) -> UserSession:
         """Create a new user session"""
         
-        # Clean up expired sessions for this user first
-        await self.cleanup_expired_sessions(user_id)
+        # Clean up expired sessions for this user first; committed together
+        # with the new session below
+        await self.cleanup_expired_sessions(user_id, commit=False)
         
         # Create new session
         session = UserSession.create_session(
@@ -42,7 +43,6 @@ class SessionService:
         
         self.db.add(session)
         await self.db.commit()
-        await self.db.refresh(session)
         
         return session
     
@@ -164,7 +164,7 @@ class SessionService:
         result = await self.db.execute(query.order_by(UserSession.last_activity.desc()))
         return result.scalars().all()
     
-    async def cleanup_expired_sessions(self, user_id: uuid.UUID = None) -> int:
+    async def cleanup_expired_sessions(self, user_id: uuid.UUID = None, commit: bool = True) -> int:
         """Clean up expired sessions"""
         query = select(UserSession).where(
             or_(
@@ -184,7 +184,8 @@ class SessionService:
             await self.db.delete(session)
             count += 1
         
-        await self.db.commit()
+        if commit:
+            await self.db.commit()
         return count
     
     async def get_session_info(self, session_token: str) -> Optional[dict]:
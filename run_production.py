@@ -219,7 +219,7 @@ class ProductionServer:
             print("   🔐 Security: No breaches detected")
             print("   💾 Resources: Properly cleaned up")
             print("   👋 Thank you for using Agno WorkSphere!")
-            print("=" "* 80)
+            print("=" * 80)
 
 
 def main():
@@ -230,6 +230,15 @@ def main():
         if sys.platform == "win32":
             # Windows-specific event loop policy
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        else:
+            # uvicorn's "loop" option only applies when uvicorn creates the
+            # loop; the server is served inside asyncio.run here, so install
+            # uvloop before it starts
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                logger.warning("uvloop not installed, using the default asyncio event loop")
         
         # Run the server
         asyncio.run(server.run())
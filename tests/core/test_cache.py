@@ -0,0 +1,85 @@
+"""
+Cache invalidation tests
+"""
+import pytest
+
+from app.core.cache import (
+    cache,
+    cache_role,
+    invalidate_member_caches,
+    invalidate_role_cache,
+    role_cache_key
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class RoleLookup:
+    def __init__(self, roles):
+        self.roles = roles
+        self.calls = 0
+
+    @cache_role(ttl=60)
+    async def get_user_role(self, user_id, organization_id):
+        self.calls += 1
+        return self.roles.get((user_id, organization_id))
+
+
+@pytest.mark.asyncio
+async def test_role_is_cached_until_invalidated():
+    lookup = RoleLookup({("u1", "o1"): "member"})
+
+    assert await lookup.get_user_role("u1", "o1") == "member"
+    lookup.roles[("u1", "o1")] = "admin"
+    assert await lookup.get_user_role("u1", "o1") == "member"
+    assert lookup.calls == 1
+
+    assert invalidate_role_cache("o1", "u1") == 1
+    assert await lookup.get_user_role("u1", "o1") == "admin"
+    assert lookup.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_role_is_not_cached():
+    lookup = RoleLookup({})
+
+    assert await lookup.get_user_role("u1", "o1") is None
+    lookup.roles[("u1", "o1")] = "member"
+    assert await lookup.get_user_role("u1", "o1") == "member"
+
+
+def test_invalidate_role_cache_for_organization_spares_other_organizations():
+    cache.set(role_cache_key("u1", "o1"), "owner", 60)
+    cache.set(role_cache_key("u2", "o1"), "member", 60)
+    cache.set(role_cache_key("u1", "o2"), "admin", 60)
+
+    assert invalidate_role_cache("o1") == 2
+    assert cache.get(role_cache_key("u1", "o2")) == "admin"
+
+
+def test_invalidate_member_caches_clears_member_views_and_role():
+    cache.set(role_cache_key("u1", "o1"), "member", 60)
+    cache.set(role_cache_key("u2", "o1"), "admin", 60)
+    cache.set("members:o1:page1", ["u1", "u2"], 60)
+    cache.set("dashboard:o1:u2", {"members": 2}, 60)
+    cache.set("members:o2:page1", ["u3"], 60)
+
+    assert invalidate_member_caches("o1", "u1") == 3
+    assert cache.get(role_cache_key("u1", "o1")) is None
+    assert cache.get(role_cache_key("u2", "o1")) == "admin"
+    assert cache.get("members:o1:page1") is None
+    assert cache.get("dashboard:o1:u2") is None
+    assert cache.get("members:o2:page1") == ["u3"]
+
+
+def test_invalidate_member_caches_without_user_clears_every_role():
+    cache.set(role_cache_key("u1", "o1"), "member", 60)
+    cache.set(role_cache_key("u2", "o1"), "admin", 60)
+
+    assert invalidate_member_caches("o1") == 2
+    assert cache.get(role_cache_key("u2", "o1")) is None
@@ -0,0 +1,85 @@
+"""
+Password hashes made below the current bcrypt cost are upgraded on login
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from passlib.hash import bcrypt
+
+from app.api.v1.endpoints import auth
+from app.core.exceptions import AuthenticationError
+from app.core.security import hash_password, password_needs_rehash, pwd_context, verify_password
+from app.schemas.auth import UserLogin
+
+PASSWORD = "CorrectHorse9!"
+
+
+class SessionCreated(Exception):
+    """Stops login once the password checks are done"""
+
+
+def weak_hash(password: str) -> str:
+    return bcrypt.using(rounds=4).hash(password)
+
+
+def make_user(password_hash: str) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), password_hash=password_hash, last_login_at=None)
+
+
+def login_db(user) -> AsyncMock:
+    result = MagicMock()
+    result.first.return_value = (user, None, None)
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+@pytest.fixture
+def stop_at_session(monkeypatch):
+    session_service = MagicMock()
+    session_service.return_value.create_session = AsyncMock(side_effect=SessionCreated)
+    monkeypatch.setattr(auth, "SessionService", session_service)
+
+
+def test_weaker_hash_needs_rehash():
+    assert password_needs_rehash(weak_hash(PASSWORD))
+    assert not password_needs_rehash(hash_password(PASSWORD))
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_weak_hash(stop_at_session):
+    user = make_user(weak_hash(PASSWORD))
+    request = SimpleNamespace(client=None, headers={})
+
+    with pytest.raises(SessionCreated):
+        await auth.login(UserLogin(email="user@example.com", password=PASSWORD), request, login_db(user))
+
+    assert not password_needs_rehash(user.password_hash)
+    assert pwd_context.identify(user.password_hash) == "bcrypt"
+    assert verify_password(PASSWORD, user.password_hash)
+
+
+@pytest.mark.asyncio
+async def test_login_keeps_current_hash(stop_at_session):
+    current_hash = hash_password(PASSWORD)
+    user = make_user(current_hash)
+    request = SimpleNamespace(client=None, headers={})
+
+    with pytest.raises(SessionCreated):
+        await auth.login(UserLogin(email="user@example.com", password=PASSWORD), request, login_db(user))
+
+    assert user.password_hash == current_hash
+
+
+@pytest.mark.asyncio
+async def test_failed_login_does_not_rehash(stop_at_session):
+    old_hash = weak_hash(PASSWORD)
+    user = make_user(old_hash)
+    request = SimpleNamespace(client=None, headers={})
+
+    with pytest.raises(AuthenticationError):
+        await auth.login(UserLogin(email="user@example.com", password="wrong"), request, login_db(user))
+
+    assert user.password_hash == old_hash
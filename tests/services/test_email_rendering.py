@@ -0,0 +1,85 @@
+"""
+Presplit email bodies must match a direct Jinja render byte for byte
+"""
+import pytest
+
+from app.services.email_rendering import (
+    DEFAULT_ROLE_COLOR,
+    ROLE_COLORS,
+    _template_env,
+    fill_placeholders,
+    render_enhanced_invitation_body,
+    render_invitation_body,
+    render_welcome
+)
+
+# Values with characters HTML autoescaping must handle
+RECIPIENT = dict(
+    to_email="o'brien+test@example.com",
+    invitation_url="http://localhost:3000/accept-invitation?token=a&b=<c>",
+    temp_password='p"ss<&>word'
+)
+
+
+def render(template_name: str, **context) -> bytes:
+    return _template_env.get_template(template_name).render(**context).encode()
+
+
+def test_invitation_matches_jinja_render():
+    shared = dict(inviter_name="Ann <Admin>", organization_name="Acme & Co", role="admin")
+    body = render_invitation_body(**shared)
+
+    assert fill_placeholders(body, escape_html=True, **RECIPIENT) == render(
+        "invitation.html", **shared, **RECIPIENT
+    )
+
+
+@pytest.mark.parametrize("project_name, custom_message", [
+    ("Apollo", "Welcome <b>aboard</b> & enjoy"),
+    (None, None)
+])
+def test_enhanced_invitation_matches_jinja_render(project_name, custom_message):
+    shared = dict(
+        inviter_name="Ann",
+        organization_name="Acme & Co",
+        role="Owner",
+        project_name=project_name,
+        custom_message=custom_message
+    )
+    html_body, text_body = render_enhanced_invitation_body(**shared)
+    context = dict(shared, role_color=ROLE_COLORS.get("owner", DEFAULT_ROLE_COLOR), **RECIPIENT)
+
+    assert fill_placeholders(html_body, escape_html=True, **RECIPIENT) == render(
+        "enhanced_invitation.html", **context
+    )
+    assert fill_placeholders(text_body, escape_html=False, **RECIPIENT) == render(
+        "enhanced_invitation.txt", **context
+    )
+
+
+def test_welcome_matches_jinja_render():
+    values = dict(
+        user_email="new&user@example.com",
+        user_name="Zoë <Z>",
+        organization_name="Acme",
+        login_url="http://localhost:3000/login?next=/a&b"
+    )
+
+    html_content, text_content = render_welcome(**values)
+
+    assert html_content == render("welcome.html", **values)
+    assert text_content == render("welcome.txt", **values)
+
+
+def test_invitation_body_is_memoized_on_shared_inputs():
+    first = render_invitation_body("Ann", "Acme", "member")
+
+    assert render_invitation_body("Ann", "Acme", "member") is first
+    assert set(first.fields) == {"to_email", "invitation_url"}
+
+
+def test_missing_placeholder_value_raises():
+    body = render_invitation_body("Ann", "Acme", "member")
+
+    with pytest.raises(KeyError):
+        fill_placeholders(body, escape_html=True, to_email="a@example.com")